@@ -0,0 +1,64 @@
+"""
+Mono Cache - On-disk caches shared by the Mono interpreters and registries
+
+Cache entries live in $XDG_CACHE_HOME/mono (~/.cache/mono by default) and are
+named <kind>-<version>-<key digest><suffix>, one file per key. A cache is only
+ever an optimization: reading a missing or damaged entry returns None, and a
+failed write is dropped.
+"""
+
+import os
+import glob
+import pickle
+import hashlib
+from typing import Any, Callable, Optional
+
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'mono')
+
+def _pickle_dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+def cache_path(kind: str, version: int, key: str, suffix: str = '.pkl') -> str:
+    """Get the path of the cache entry for a key, such as the absolute path of a script."""
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"{kind}-{version}-{digest}{suffix}")
+
+def read_cache(path: str, loads: Callable[[bytes], Any] = pickle.loads) -> Optional[Any]:
+    """Load a cache entry, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            return loads(f.read())
+    except Exception:
+        return None
+
+def write_cache(path: str, value: Any, dumps: Callable[[Any], bytes] = _pickle_dumps) -> None:
+    """Atomically write a cache entry; failures only cost a rebuild next time."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(value))
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+    finally:
+        try:
+            os.remove(tmp_path)  # Only still there if the write failed
+        except OSError:
+            pass
+
+def prune_cache(path: str) -> None:
+    """
+    Remove the entries made obsolete by a cache_path entry: entries of the same
+    kind from other cache versions, and temp files left behind for its key.
+    """
+    directory, name = os.path.split(path)
+    kind, version, key = name.split('-', 2)
+    for stale in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(kind)}-*")):
+        stale_name = os.path.basename(stale)
+        stale_version = stale_name[len(kind) + 1:].split('-', 1)[0]
+        if stale_version != version or (stale != path and stale_name.startswith(f"{kind}-{version}-{key}")):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
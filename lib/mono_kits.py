@@ -12,14 +12,161 @@ import os
 import re
 import json
 import shutil
+import types
 import importlib
+import functools
+import concurrent.futures
 import semver
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 
+from lib.mono_cache import cache_path, read_cache, write_cache, prune_cache
+
+# Number of threads used to copy component files in Kit.save
+_SAVE_WORKERS = 8
+
+# Leading fields of a kit.json, read at startup without parsing the whole file
+_KIT_HEADER_SIZE = 4096
+_JSON_STRING = r'("(?:[^"\\]|\\.)*")'
+_KIT_HEADER_RE = re.compile(
+    r'\s*\{\s*"name"\s*:\s*' + _JSON_STRING +
+    r'\s*,\s*"version"\s*:\s*' + _JSON_STRING +
+    r'(?:\s*,\s*"description"\s*:\s*' + _JSON_STRING + r')?'
+)
+
+# Kit definition grammar
+_KIT_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+# The body runs to the last closing brace so that nested sections are kept intact
+_KIT_DEF_RE = re.compile(r'kit\s+(\w+)(?:\s+version\s+([0-9]+\.[0-9]+\.[0-9]+))?\s*{(.*)}', re.DOTALL)
+_KIT_SECTION_RE = re.compile(r'description\s+"(?P<desc>[^"]*)"|(?P<kind>collect|tools|depends)\s+{(?P<body>[^}]*)}')
+_KIT_COMPONENT_RE = re.compile(r'(\w+)(?:\s+from\s+"([^"]*)")?(?:\s+as\s+"([^"]*)")?')
+_KIT_TOOL_RE = re.compile(r'(\w+)\s+"([^"]*)"(?:\s+as\s+"([^"]*)")?')
+_KIT_DEPENDENCY_RE = re.compile(r'(\w+)(?:\s+version\s+([\^~]?[0-9.]+))?')
+
+# Persistent index of kit.json headers, one cache entry per registry directory;
+# bump _REGISTRY_CACHE_VERSION whenever the records change
+_REGISTRY_CACHE_VERSION = 2
+
+# kit.json path -> ((mtime_ns, size), name, version, description, full data or None)
+_CacheRecord = Tuple[Tuple[int, int], str, str, str, Optional[Dict[str, Any]]]
+
+def _read_kit_header(kit_file: str, stamp: Tuple[int, int]) -> _CacheRecord:
+    """Read the name, version and description from the start of a kit.json."""
+    with open(kit_file, "r") as f:
+        head = f.read(_KIT_HEADER_SIZE)
+        header = _KIT_HEADER_RE.match(head)
+        if header is None or (header.group(3) is None and '"description"' in head):
+            # Unusual layout, or a description running past the header; fall back to a full parse
+            kit_data = json.loads(head + f.read())
+            return (stamp, kit_data["name"], kit_data["version"], kit_data.get("description", ""), kit_data)
+    
+    name, version, description = (json.loads(token) if token else "" for token in header.groups())
+    return (stamp, name, version, description, None)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_version(version: str) -> semver.VersionInfo:
+    """Parse a semantic version string, caching the (immutable) result."""
+    return semver.VersionInfo.parse(version)
+
+def _parse_version_req(requirement: str) -> str:
+    """
+    Validate an x.y.z, ^x.y.z or ~x.y.z requirement without a regex.
+    Returns the requirement unchanged, or raises ValueError if it is malformed.
+    """
+    version = requirement[1:] if requirement[0] in "^~" else requirement
+    parts = version.split(".")
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid version requirement: {requirement}")
+    return requirement
+
+def _satisfies(version: str, requirement: str) -> bool:
+    """
+    Check whether a version satisfies a requirement.
+    Supports "*", exact versions, caret (^x.y.z), tilde (~x.y.z) and
+    semver comparison expressions such as ">=1.2.0".
+    """
+    if requirement == "*":
+        return True
+    
+    parsed = _parse_version(version)
+    if requirement[0] in "^~":
+        base = _parse_version(requirement[1:])
+        if parsed < base:
+            return False
+        if requirement[0] == "~":
+            return parsed.major == base.major and parsed.minor == base.minor
+        # Caret: allow changes that do not modify the left-most non-zero part
+        if base.major != 0:
+            return parsed.major == base.major
+        if base.minor != 0:
+            return parsed.major == 0 and parsed.minor == base.minor
+        return parsed.major == 0 and parsed.minor == 0 and parsed.patch == base.patch
+    
+    if requirement[0].isdigit():
+        return parsed == _parse_version(requirement)
+    return parsed.match(requirement)
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a file keeping the data in kernel space where possible.
+    Tries os.copy_file_range, then os.sendfile, then falls back to shutil.copy2.
+    """
+    # Refuse to copy a file onto itself before dst is truncated, as shutil.copy2 does
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    try:
+        in_fd = os.open(src, os.O_RDONLY)
+        try:
+            size = os.fstat(in_fd).st_size
+            out_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                copied = 0
+                if hasattr(os, "copy_file_range"):
+                    try:
+                        while copied < size:
+                            n = os.copy_file_range(in_fd, out_fd, size - copied)
+                            if n == 0:
+                                break
+                            copied += n
+                    except OSError:
+                        # Not supported for this pair of files; restart with sendfile
+                        os.lseek(in_fd, 0, os.SEEK_SET)
+                        os.ftruncate(out_fd, 0)
+                        os.lseek(out_fd, 0, os.SEEK_SET)
+                        copied = 0
+                if copied < size:
+                    while copied < size:
+                        n = os.sendfile(out_fd, in_fd, copied, size - copied)
+                        if n == 0:
+                            break
+                        copied += n
+            finally:
+                os.close(out_fd)
+        finally:
+            os.close(in_fd)
+        if copied < size:
+            raise OSError(f"Short copy from {src} to {dst}")
+    except (OSError, AttributeError):
+        shutil.copy2(src, dst)
+        return
+    
+    # Preserve timestamps and permission bits like shutil.copy2
+    shutil.copystat(src, dst)
+
+def _write_tool_script(tool_path: str, command: str, description: str) -> None:
+    """Write an executable shell script for a kit tool."""
+    with open(tool_path, "w") as f:
+        f.write("#!/bin/bash\n\n")
+        f.write(f"# {description}\n\n")
+        f.write(command)
+    os.chmod(tool_path, 0o755)  # Make executable
+
 class KitComponent:
     """
     Represents a component in a kit.
     """
+    __slots__ = ("name", "source_path", "description")
+    
     def __init__(self, name: str, source_path: str, description: str = ""):
         self.name = name
         self.source_path = source_path
@@ -46,6 +193,8 @@ class KitTool:
     """
     Represents a tool in a kit.
     """
+    __slots__ = ("name", "command", "description")
+    
     def __init__(self, name: str, command: str, description: str = ""):
         self.name = name
         self.command = command
@@ -71,26 +220,121 @@ class KitTool:
 class Kit:
     """
     Represents a kit (collection of components, tools, and utilities).
+    Components and tools are stored as parallel lists of their fields rather
+    than as one object per entry; use get_component/get_tool for lookups.
     """
+    __slots__ = (
+        "name", "version", "description",
+        "component_names", "component_paths", "component_descs", "_component_idx",
+        "tool_names", "tool_commands", "tool_descs", "_tool_idx",
+        "dependencies", "_summary"
+    )
+    
     def __init__(self, name: str, version: str, description: str = ""):
         self.name = name
         self.version = version
         self.description = description
-        self.components: Dict[str, KitComponent] = {}
-        self.tools: Dict[str, KitTool] = {}
+        self.component_names: List[str] = []
+        self.component_paths: List[str] = []
+        self.component_descs: List[str] = []
+        self._component_idx: Dict[str, int] = {}  # Component name -> list index
+        self.tool_names: List[str] = []
+        self.tool_commands: List[str] = []
+        self.tool_descs: List[str] = []
+        self._tool_idx: Dict[str, int] = {}  # Tool name -> list index
         self.dependencies: Dict[str, str] = {}  # Kit name -> version requirement
+        self._summary: Optional[Dict[str, Any]] = None  # Cached registry listing entry
+    
+    @property
+    def components(self) -> 'types.MappingProxyType[str, KitComponent]':
+        """
+        Read-only name -> KitComponent mapping, built on access.
+        The KitComponent objects are copies; use add_component to add or change one.
+        """
+        return types.MappingProxyType({
+            name: KitComponent(name, path, desc)
+            for name, path, desc in zip(self.component_names, self.component_paths, self.component_descs)
+        })
+    
+    @property
+    def tools(self) -> 'types.MappingProxyType[str, KitTool]':
+        """
+        Read-only name -> KitTool mapping, built on access.
+        The KitTool objects are copies; use add_tool to add or change one.
+        """
+        return types.MappingProxyType({
+            name: KitTool(name, command, desc)
+            for name, command, desc in zip(self.tool_names, self.tool_commands, self.tool_descs)
+        })
+    
+    def _set_component(self, name: str, source_path: str, description: str) -> None:
+        """Add or replace a component's fields."""
+        idx = self._component_idx.get(name)
+        if idx is None:
+            self._component_idx[name] = len(self.component_names)
+            self.component_names.append(name)
+            self.component_paths.append(source_path)
+            self.component_descs.append(description)
+        else:
+            self.component_paths[idx] = source_path
+            self.component_descs[idx] = description
+    
+    def _set_tool(self, name: str, command: str, description: str) -> None:
+        """Add or replace a tool's fields."""
+        idx = self._tool_idx.get(name)
+        if idx is None:
+            self._tool_idx[name] = len(self.tool_names)
+            self.tool_names.append(name)
+            self.tool_commands.append(command)
+            self.tool_descs.append(description)
+        else:
+            self.tool_commands[idx] = command
+            self.tool_descs[idx] = description
     
     def add_component(self, component: KitComponent) -> None:
         """Add a component to the kit."""
-        self.components[component.name] = component
+        self._set_component(component.name, component.source_path, component.description)
+        self._summary = None
     
     def add_tool(self, tool: KitTool) -> None:
         """Add a tool to the kit."""
-        self.tools[tool.name] = tool
+        self._set_tool(tool.name, tool.command, tool.description)
+        self._summary = None
     
     def add_dependency(self, kit_name: str, version_requirement: str) -> None:
         """Add a dependency on another kit."""
         self.dependencies[kit_name] = version_requirement
+        self._summary = None
+    
+    def get_component(self, name: str) -> Optional[KitComponent]:
+        """Get a component by name."""
+        idx = self._component_idx.get(name)
+        if idx is None:
+            return None
+        return KitComponent(name, self.component_paths[idx], self.component_descs[idx])
+    
+    def get_tool(self, name: str) -> Optional[KitTool]:
+        """Get a tool by name."""
+        idx = self._tool_idx.get(name)
+        if idx is None:
+            return None
+        return KitTool(name, self.tool_commands[idx], self.tool_descs[idx])
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the summary used by registry listings.
+        The dict is built once and shared between calls, so treat it as read-only.
+        """
+        if self._summary is None:
+            self._summary = {
+                "name": self.name,
+                "version": self.version,
+                "description": self.description,
+                "components": len(self.component_names),
+                "tools": len(self.tool_names),
+                "dependencies": self.dependencies
+            }
+        return self._summary
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -98,8 +342,14 @@ class Kit:
             "name": self.name,
             "version": self.version,
             "description": self.description,
-            "components": {name: comp.to_dict() for name, comp in self.components.items()},
-            "tools": {name: tool.to_dict() for name, tool in self.tools.items()},
+            "components": {
+                name: {"name": name, "source_path": path, "description": desc}
+                for name, path, desc in zip(self.component_names, self.component_paths, self.component_descs)
+            },
+            "tools": {
+                name: {"name": name, "command": command, "description": desc}
+                for name, command, desc in zip(self.tool_names, self.tool_commands, self.tool_descs)
+            },
             "dependencies": self.dependencies
         }
     
@@ -113,28 +363,33 @@ class Kit:
         )
         
         # Add components
-        for name, comp_data in data.get("components", {}).items():
-            kit.add_component(KitComponent.from_dict(comp_data))
+        for comp_data in data.get("components", {}).values():
+            kit._set_component(comp_data["name"], comp_data["source_path"], comp_data.get("description", ""))
         
         # Add tools
-        for name, tool_data in data.get("tools", {}).items():
-            kit.add_tool(KitTool.from_dict(tool_data))
+        for tool_data in data.get("tools", {}).values():
+            kit._set_tool(tool_data["name"], tool_data["command"], tool_data.get("description", ""))
         
         # Add dependencies
-        for dep_name, dep_version in data.get("dependencies", {}).items():
-            kit.add_dependency(dep_name, dep_version)
+        kit.dependencies.update(data.get("dependencies", {}))
         
         return kit
     
-    def save(self, directory: str) -> None:
-        """Save the kit to a directory."""
+    def save(self, directory: str, pretty: bool = False) -> None:
+        """
+        Save the kit to a directory.
+        kit.json is written compactly unless pretty is set, for kits meant to be hand-edited.
+        """
         # Create the kit directory if it doesn't exist
         kit_dir = os.path.join(directory, self.name)
         os.makedirs(kit_dir, exist_ok=True)
         
         # Save the kit metadata
         with open(os.path.join(kit_dir, "kit.json"), "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+            if pretty:
+                json.dump(self.to_dict(), f, indent=2)
+            else:
+                json.dump(self.to_dict(), f, separators=(",", ":"))
         
         # Create directories for components and tools
         components_dir = os.path.join(kit_dir, "components")
@@ -142,118 +397,205 @@ class Kit:
         os.makedirs(components_dir, exist_ok=True)
         os.makedirs(tools_dir, exist_ok=True)
         
-        # Copy component source files
-        for name, component in self.components.items():
-            source_path = component.source_path
+        # Collect component copies and tool scripts up front; components sharing a
+        # basename share a destination, and the last one wins as in a sequential copy
+        copies: Dict[str, str] = {}  # dest path -> source path
+        for source_path in self.component_paths:
             if os.path.isfile(source_path):
                 dest_path = os.path.join(components_dir, os.path.basename(source_path))
-                shutil.copy2(source_path, dest_path)
-        
-        # Create tool scripts
-        for name, tool in self.tools.items():
-            tool_path = os.path.join(tools_dir, name)
-            with open(tool_path, "w") as f:
-                f.write("#!/bin/bash\n\n")
-                f.write(f"# {tool.description}\n\n")
-                f.write(tool.command)
-            os.chmod(tool_path, 0o755)  # Make executable
+                copies[dest_path] = source_path
+        
+        scripts: List[Tuple[str, str, str]] = [
+            (os.path.join(tools_dir, name), command, desc)
+            for name, command, desc in zip(self.tool_names, self.tool_commands, self.tool_descs)
+        ]
+        
+        # Small kits are not worth the thread pool start-up cost
+        if len(copies) + len(scripts) <= 1:
+            for dest_path, source_path in copies.items():
+                _fast_copy(source_path, dest_path)
+            for script in scripts:
+                _write_tool_script(*script)
+            return
+        
+        # Copy component source files and create tool scripts in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_SAVE_WORKERS) as executor:
+            futures = [executor.submit(_fast_copy, src, dst) for dst, src in copies.items()]
+            futures.extend(executor.submit(_write_tool_script, *script) for script in scripts)
+            for future in futures:
+                future.result()  # Re-raise any copy/write error
 
 class KitRegistry:
     """
     Registry for kits.
+    Kits are indexed from the name, version and description at the top of each
+    kit.json and only fully deserialized the first time they are accessed.
     """
     def __init__(self, registry_dir: str):
         self.registry_dir = registry_dir
-        self.kits: Dict[str, Dict[str, Kit]] = {}  # name -> version -> Kit
+        self._kit_paths: Dict[str, Dict[str, Optional[str]]] = {}  # name -> version -> kit.json path
+        self._kit_cache: Dict[Tuple[str, str], Kit] = {}  # (name, version) -> loaded Kit
+        self._search_flat: List[Tuple[str, str, str, str]] = []  # (lower name, lower description, name, version)
+        self._sorted_versions: Dict[str, List[str]] = {}  # name -> versions, oldest first
         self.load_kits()
     
+    @property
+    def kits(self) -> Dict[str, Dict[str, Kit]]:
+        """All kits as name -> version -> Kit. Loads every kit that is not loaded yet."""
+        result: Dict[str, Dict[str, Kit]] = {}
+        for name, versions in self._kit_paths.items():
+            for version in versions:
+                kit = self._load(name, version)
+                if kit is not None:
+                    result.setdefault(name, {})[version] = kit
+        return result
+    
     def load_kits(self) -> None:
-        """Load all kits from the registry directory."""
+        """
+        Index all kits in the registry directory, replacing any earlier index.
+        Index entries are persisted in a pickle cache under the user's cache directory
+        and reused for every kit.json whose mtime and size are unchanged.
+        """
+        self._kit_paths.clear()
+        self._kit_cache.clear()
+        self._search_flat.clear()
+        self._sorted_versions.clear()
+        
         if not os.path.isdir(self.registry_dir):
             os.makedirs(self.registry_dir, exist_ok=True)
             return
         
-        for kit_name in os.listdir(self.registry_dir):
-            kit_dir = os.path.join(self.registry_dir, kit_name)
-            if os.path.isdir(kit_dir):
-                kit_file = os.path.join(kit_dir, "kit.json")
-                if os.path.isfile(kit_file):
-                    try:
-                        with open(kit_file, "r") as f:
-                            kit_data = json.load(f)
-                        kit = Kit.from_dict(kit_data)
-                        
-                        # Add to registry
-                        if kit.name not in self.kits:
-                            self.kits[kit.name] = {}
-                        self.kits[kit.name][kit.version] = kit
-                    except Exception as e:
-                        print(f"Error loading kit {kit_name}: {e}")
-    
-    def register_kit(self, kit: Kit) -> None:
+        path = cache_path("kits", _REGISTRY_CACHE_VERSION, os.path.abspath(self.registry_dir), ".cache")
+        cached = read_cache(path)
+        if not isinstance(cached, dict):
+            cached = {}
+        manifest: Dict[str, _CacheRecord] = {}
+        
+        with os.scandir(self.registry_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                kit_file = os.path.join(entry.path, "kit.json")
+                try:
+                    st = os.stat(kit_file)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    record = cached.get(kit_file)
+                    if record is None or record[0] != stamp:
+                        record = _read_kit_header(kit_file, stamp)
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    print(f"Error loading kit {entry.name}: {e}")
+                    continue
+                
+                try:
+                    _, name, version, description, kit_data = record
+                    self._add_entry(name, version, description, kit_file)
+                    if kit_data is not None:
+                        self._kit_cache[(name, version)] = Kit.from_dict(kit_data)
+                    manifest[kit_file] = record
+                except Exception as e:
+                    print(f"Error loading kit {entry.name}: {e}")
+        
+        if manifest != cached:
+            write_cache(path, manifest)
+            prune_cache(path)
+    
+    def _add_entry(self, name: str, version: str, description: str, path: Optional[str]) -> None:
+        """Add a kit to the version and search indexes."""
+        parsed = _parse_version(version)  # Validate before touching any index
+        
+        versions_by_name = self._kit_paths.setdefault(name, {})
+        if version in versions_by_name:
+            # Re-indexing a kit replaces its search entry rather than adding a second one
+            self._search_flat = [item for item in self._search_flat if item[2] != name or item[3] != version]
+        versions_by_name[version] = path
+        
+        # Keep versions sorted so the latest one is always last
+        versions = self._sorted_versions.setdefault(name, [])
+        if version in versions:
+            versions.remove(version)
+        lo, hi = 0, len(versions)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _parse_version(versions[mid]) < parsed:
+                lo = mid + 1
+            else:
+                hi = mid
+        versions.insert(lo, version)
+        
+        # Lowercase the searchable fields once
+        self._search_flat.append((name.lower(), description.lower(), name, version))
+    
+    def _load(self, name: str, version: str) -> Optional[Kit]:
+        """Get a kit, deserializing its kit.json on first access."""
+        kit = self._kit_cache.get((name, version))
+        if kit is not None:
+            return kit
+        
+        path = self._kit_paths.get(name, {}).get(version)
+        if path is None:
+            return None
+        
+        try:
+            with open(path, "r") as f:
+                kit = Kit.from_dict(json.load(f))
+        except Exception as e:
+            print(f"Error loading kit {name}: {e}")
+            return None
+        
+        self._kit_cache[(name, version)] = kit
+        return kit
+    
+    def register_kit(self, kit: Kit, pretty: bool = False) -> None:
         """Register a kit in the registry."""
         # Check if the kit already exists
-        if kit.name in self.kits and kit.version in self.kits[kit.name]:
+        if kit.version in self._kit_paths.get(kit.name, {}):
             raise ValueError(f"Kit {kit.name} version {kit.version} already exists")
         
         # Add to registry
-        if kit.name not in self.kits:
-            self.kits[kit.name] = {}
-        self.kits[kit.name][kit.version] = kit
+        self._add_entry(kit.name, kit.version, kit.description, None)
+        self._kit_cache[(kit.name, kit.version)] = kit
         
         # Save the kit
-        kit.save(self.registry_dir)
+        kit.save(self.registry_dir, pretty=pretty)
     
     def get_kit(self, name: str, version: Optional[str] = None) -> Optional[Kit]:
         """
         Get a kit by name and version.
         If version is None, returns the latest version.
         """
-        if name not in self.kits:
+        if name not in self._kit_paths:
             return None
         
         if version is not None:
-            return self.kits[name].get(version)
+            return self._load(name, version)
         
-        # Find the latest version
-        versions = list(self.kits[name].keys())
+        # Versions are kept sorted by semver, so the latest is last
+        versions = self._sorted_versions.get(name)
         if not versions:
             return None
-        
-        # Sort versions using semver
-        versions.sort(key=lambda v: semver.VersionInfo.parse(v), reverse=True)
-        return self.kits[name][versions[0]]
+        return self._load(name, versions[-1])
     
     def list_kits(self) -> List[Dict[str, Any]]:
         """List all kits in the registry."""
         result = []
-        for name, versions in self.kits.items():
-            for version, kit in versions.items():
-                result.append({
-                    "name": name,
-                    "version": version,
-                    "description": kit.description,
-                    "components": len(kit.components),
-                    "tools": len(kit.tools),
-                    "dependencies": kit.dependencies
-                })
+        for name, versions in self._kit_paths.items():
+            for version in versions:
+                kit = self._load(name, version)
+                if kit is not None:
+                    result.append(kit.summary())
         return result
     
     def search_kits(self, query: str) -> List[Dict[str, Any]]:
         """Search for kits by name or description."""
         query = query.lower()
         result = []
-        for name, versions in self.kits.items():
-            for version, kit in versions.items():
-                if query in name.lower() or query in kit.description.lower():
-                    result.append({
-                        "name": name,
-                        "version": version,
-                        "description": kit.description,
-                        "components": len(kit.components),
-                        "tools": len(kit.tools),
-                        "dependencies": kit.dependencies
-                    })
+        for name_lower, description_lower, name, version in self._search_flat:
+            if query in name_lower or query in description_lower:
+                kit = self._load(name, version)
+                if kit is not None:
+                    result.append(kit.summary())
         return result
 
 class KitParser:
@@ -262,20 +604,35 @@ class KitParser:
     """
     def __init__(self, registry: KitRegistry):
         self.registry = registry
+        self._parse_cache: Dict[str, Tuple[float, int, Kit]] = {}  # path -> (mtime, size, Kit)
     
     def parse_file(self, file_path: str) -> Kit:
-        """Parse a kit definition file."""
+        """
+        Parse a kit definition file.
+        Results are cached per file and reused while the file's mtime and size
+        are unchanged. The returned Kit is shared, so callers should treat it
+        as read-only.
+        """
+        key = os.path.abspath(file_path)
+        st = os.stat(key)
+        cached = self._parse_cache.get(key)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            return cached[2]
+        
         with open(file_path, "r") as f:
             content = f.read()
-        return self.parse(content)
+        kit = self.parse(content)
+        
+        self._parse_cache[key] = (st.st_mtime, st.st_size, kit)
+        return kit
     
     def parse(self, content: str) -> Kit:
         """Parse kit definition content."""
         # Remove comments
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
+        content = _KIT_COMMENT_RE.sub('', content)
         
         # Find kit definition
-        kit_match = re.search(r'kit\s+(\w+)(?:\s+version\s+([0-9]+\.[0-9]+\.[0-9]+))?\s*{([^}]*)}', content, re.DOTALL)
+        kit_match = _KIT_DEF_RE.search(content)
         if not kit_match:
             raise ValueError("No kit definition found")
         
@@ -286,39 +643,36 @@ class KitParser:
         # Create the kit
         kit = Kit(kit_name, kit_version)
         
-        # Find description
-        desc_match = re.search(r'description\s+"([^"]*)"', kit_body)
-        if desc_match:
-            kit.description = desc_match.group(1)
-        
-        # Find components
-        components_match = re.search(r'collect\s+{([^}]*)}', kit_body)
-        if components_match:
-            components_list = components_match.group(1)
-            for comp in re.finditer(r'(\w+)(?:\s+from\s+"([^"]*)")?(?:\s+as\s+"([^"]*)")?', components_list):
-                comp_name = comp.group(1)
-                comp_path = comp.group(2) or f"components/{comp_name}.mono"
-                comp_desc = comp.group(3) or f"{comp_name} component"
-                kit.add_component(KitComponent(comp_name, comp_path, comp_desc))
-        
-        # Find tools
-        tools_match = re.search(r'tools\s+{([^}]*)}', kit_body)
-        if tools_match:
-            tools_list = tools_match.group(1)
-            for tool in re.finditer(r'(\w+)\s+"([^"]*)"(?:\s+as\s+"([^"]*)")?', tools_list):
-                tool_name = tool.group(1)
-                tool_command = tool.group(2)
-                tool_desc = tool.group(3) or f"{tool_name} tool"
-                kit.add_tool(KitTool(tool_name, tool_command, tool_desc))
-        
-        # Find dependencies
-        deps_match = re.search(r'depends\s+{([^}]*)}', kit_body)
-        if deps_match:
-            deps_list = deps_match.group(1)
-            for dep in re.finditer(r'(\w+)(?:\s+version\s+([0-9]+\.[0-9]+\.[0-9]+|\^[0-9]+\.[0-9]+\.[0-9]+|~[0-9]+\.[0-9]+\.[0-9]+))?', deps_list):
-                dep_name = dep.group(1)
-                dep_version = dep.group(2) or "*"  # Any version
-                kit.add_dependency(dep_name, dep_version)
+        # Walk the kit body once, dispatching on each section as it is found
+        seen: Set[str] = set()
+        for section in _KIT_SECTION_RE.finditer(kit_body):
+            kind = section.group("kind") or "description"
+            if kind in seen:
+                continue  # First occurrence wins
+            seen.add(kind)
+            
+            if kind == "description":
+                kit.description = section.group("desc")
+            
+            elif kind == "collect":
+                for comp in _KIT_COMPONENT_RE.finditer(section.group("body")):
+                    comp_name = comp.group(1)
+                    comp_path = comp.group(2) or f"components/{comp_name}.mono"
+                    comp_desc = comp.group(3) or f"{comp_name} component"
+                    kit.add_component(KitComponent(comp_name, comp_path, comp_desc))
+            
+            elif kind == "tools":
+                for tool in _KIT_TOOL_RE.finditer(section.group("body")):
+                    tool_name = tool.group(1)
+                    tool_command = tool.group(2)
+                    tool_desc = tool.group(3) or f"{tool_name} tool"
+                    kit.add_tool(KitTool(tool_name, tool_command, tool_desc))
+            
+            elif kind == "depends":
+                for dep in _KIT_DEPENDENCY_RE.finditer(section.group("body")):
+                    dep_name = dep.group(1)
+                    dep_version = _parse_version_req(dep.group(2)) if dep.group(2) else "*"  # Any version
+                    kit.add_dependency(dep_name, dep_version)
         
         return kit
 
@@ -329,6 +683,35 @@ class KitLoader:
     def __init__(self, registry: KitRegistry):
         self.registry = registry
         self.loaded_kits: Dict[str, Kit] = {}
+        self._satisfies_cache: Dict[Tuple[str, str, Tuple[str, ...]], Optional[str]] = {}
+    
+    def _resolve(self, name: str, requirement: str) -> Optional[str]:
+        """
+        Resolve a version requirement to the highest installed version satisfying it.
+        Results are cached until the set of installed versions for the kit changes.
+        """
+        versions = self.registry._sorted_versions.get(name)
+        if not versions:
+            return None
+        
+        # Most requirements are satisfied by the latest version, so try it
+        # before building the cache key or scanning older versions
+        latest = versions[-1]
+        if _satisfies(latest, requirement):
+            return latest
+        
+        key = (name, requirement, tuple(versions))
+        if key in self._satisfies_cache:
+            return self._satisfies_cache[key]
+        
+        resolved = None
+        for candidate in reversed(versions[:-1]):
+            if _satisfies(candidate, requirement):
+                resolved = candidate
+                break
+        
+        self._satisfies_cache[key] = resolved
+        return resolved
     
     def load_kit(self, name: str, version: Optional[str] = None) -> Optional[Kit]:
         """
@@ -340,6 +723,15 @@ class KitLoader:
         if key in self.loaded_kits:
             return self.loaded_kits[key]
         
+        # Resolve ranges such as "^1.0.0" or "*" to an installed version
+        if version is not None and version not in self.registry._kit_paths.get(name, {}):
+            try:
+                version = self._resolve(name, version)
+            except ValueError:
+                return None  # Malformed requirement
+            if version is None:
+                return None
+        
         # Get the kit from the registry
         kit = self.registry.get_kit(name, version)
         if not kit:
@@ -358,14 +750,14 @@ class KitLoader:
         kit = self.load_kit(kit_name, version)
         if not kit:
             return None
-        return kit.components.get(component_name)
+        return kit.get_component(component_name)
     
     def get_tool(self, kit_name: str, tool_name: str, version: Optional[str] = None) -> Optional[KitTool]:
         """Get a tool from a kit."""
         kit = self.load_kit(kit_name, version)
         if not kit:
             return None
-        return kit.tools.get(tool_name)
+        return kit.get_tool(tool_name)
 
 # Global registry
 _registry_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kits")
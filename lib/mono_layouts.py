@@ -8,15 +8,84 @@ This module provides support for:
 4. Z-Ordering: Manage overlapping components
 """
 
+import os
 import re
 import json
 import math
+import collections
+import functools
+import operator
+import types
 from typing import Dict, List, Any, Optional, Union, Tuple, Set, Callable
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_loads(content: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, falling back to the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(content)
+
+def _json_dumps(data: Any) -> str:
+    """Encode JSON with orjson when available, falling back to the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"))
+
+# Sort key for rendering children in z-order
+_Z_KEY = operator.attrgetter('_z_index')
+
+# Unit codes used by the layout pass; unknown units are treated as pixels
+_UNIT_PX, _UNIT_PERCENT, _UNIT_VH, _UNIT_VW = 0, 1, 2, 3
+_UNIT_CODES = {"px": _UNIT_PX, "%": _UNIT_PERCENT, "vh": _UNIT_VH, "vw": _UNIT_VW}
+
+# Bits of LayoutBox._constraint_mask for the constraints used by the layout pass
+_CONSTRAINT_LEFT = 1
+_CONSTRAINT_RIGHT = 2
+_CONSTRAINT_CENTER_X = 4
+_CONSTRAINT_TOP = 8
+_CONSTRAINT_BOTTOM = 16
+_CONSTRAINT_CENTER_Y = 32
+_CONSTRAINT_BITS = {
+    "left": _CONSTRAINT_LEFT,
+    "right": _CONSTRAINT_RIGHT,
+    "centerX": _CONSTRAINT_CENTER_X,
+    "top": _CONSTRAINT_TOP,
+    "bottom": _CONSTRAINT_BOTTOM,
+    "centerY": _CONSTRAINT_CENTER_Y,
+}
+
+# Layout DSL patterns, compiled once at import
+_RE_UNIT = re.compile(r'([-+]?\d*\.?\d+)([a-zA-Z%]+)?')
+_RE_CONSTRAINT = re.compile(r'(\w+)\((.*?)\)')
+_RE_COMMENT = re.compile(r'//.*$', re.MULTILINE)
+_RE_PROP = re.compile(r'(\w+)\s*:\s*([^;]*);')
+_RE_FLOAT = re.compile(r'^[-+]?\d*\.\d+$')
+# Block structure of a layout file: comments, braces and statement ends, scanned in one pass
+_RE_DSL_TOKEN = re.compile(r'//[^\n]*|[{};]')
+_RE_BLOCK_HEADER = re.compile(r'(\w+)(?:\s+(\w+))?\s*(?:\(([^)]*)\))?\s*$')
+# One pass over an element body: child elements, constraints and plain properties
+_RE_ELEMENT_ITEM = re.compile(
+    r'(?<![\w-])(?:'
+    r'element\s+(?P<child>\w+)\s*{'
+    r'|constraint\s+(?P<constraint>\w+)\s*:\s*(?P<cvalue>[^;]*);'
+    r'|(?P<prop>width|height|x|y|z-index)\s*:\s*(?P<value>[^;]*);'
+    r')'
+)
+_RE_MEDIA_CONDITION = re.compile(r'(min-width|max-width|min-height|max-height)\s*:\s*(\d+)(px|%|vh|vw)?')
+
 class LayoutUnit:
     """
     Represents a layout unit (px, %, vh, vw, etc.).
+    Units are shared between boxes (see _ZERO_PX and LayoutUnit.parse), so treat
+    them as immutable and assign a new LayoutUnit instead of changing one.
     """
+    __slots__ = ("value", "unit")
+    
     def __init__(self, value: Union[int, float], unit: str = "px"):
         self.value = value
         self.unit = unit
@@ -41,24 +110,21 @@ class LayoutUnit:
     
     @classmethod
     def parse(cls, value: str) -> 'LayoutUnit':
-        """Parse a string into a LayoutUnit."""
-        if not value:
-            return cls(0, "px")
-        
-        # Extract the numeric part and unit
-        match = re.match(r'([-+]?\d*\.?\d+)([a-zA-Z%]+)?', value)
-        if not match:
-            return cls(0, "px")
-        
-        num_value = float(match.group(1))
-        unit = match.group(2) or "px"
-        
-        return cls(num_value, unit)
+        """
+        Parse a string into a LayoutUnit.
+        Results are cached and shared, so callers must not mutate them.
+        """
+        return _parse_unit(value)
+
+# Shared zero unit used as the default position and size of every LayoutBox
+_ZERO_PX = LayoutUnit(0, "px")
 
 class LayoutConstraint:
     """
     Represents a layout constraint (e.g., "center", "fill", "start", "end").
     """
+    __slots__ = ("type", "value", "reference")
+    
     def __init__(self, type: str, value: Optional[LayoutUnit] = None, reference: Optional[str] = None):
         self.type = type  # center, fill, start, end, etc.
         self.value = value  # Optional value (e.g., for margins, padding)
@@ -96,64 +162,214 @@ class LayoutConstraint:
     
     @classmethod
     def parse(cls, value: str) -> 'LayoutConstraint':
-        """Parse a string into a LayoutConstraint."""
-        if not value:
-            return cls("none")
-        
-        # Check for simple constraints
-        if value in ["center", "fill", "start", "end", "stretch"]:
-            return cls(value)
-        
-        # Check for constraints with values
-        match = re.match(r'(\w+)\((.*?)\)', value)
-        if match:
-            constraint_type = match.group(1)
-            constraint_value = match.group(2)
-            
-            # Check if it's a reference
-            if constraint_value.startswith("ref:"):
-                return cls(constraint_type, reference=constraint_value[4:])
-            
-            # Otherwise, it's a value
-            return cls(constraint_type, LayoutUnit.parse(constraint_value))
-        
-        # Default
-        return cls(value)
+        """
+        Parse a string into a LayoutConstraint.
+        Results are cached and shared, so callers must not mutate them.
+        """
+        return _parse_constraint(value)
+
+@functools.lru_cache(maxsize=2048)
+def _parse_unit(value: str) -> LayoutUnit:
+    """Parse a string into a LayoutUnit; cached behind LayoutUnit.parse."""
+    if not value:
+        return _ZERO_PX
+    
+    # Extract the numeric part and unit
+    match = _RE_UNIT.match(value)
+    if not match:
+        return _ZERO_PX
+    
+    num_value = float(match.group(1))
+    unit = match.group(2) or "px"
+    
+    return LayoutUnit(num_value, unit)
+
+@functools.lru_cache(maxsize=2048)
+def _parse_constraint(value: str) -> LayoutConstraint:
+    """Parse a string into a LayoutConstraint; cached behind LayoutConstraint.parse."""
+    if not value:
+        return LayoutConstraint("none")
+    
+    # Check for simple constraints
+    if value in ["center", "fill", "start", "end", "stretch"]:
+        return LayoutConstraint(value)
+    
+    # Check for constraints with values
+    match = _RE_CONSTRAINT.match(value)
+    if match:
+        constraint_type = match.group(1)
+        constraint_value = match.group(2)
+        
+        # Check if it's a reference
+        if constraint_value.startswith("ref:"):
+            return LayoutConstraint(constraint_type, reference=constraint_value[4:])
+        
+        # Otherwise, it's a value
+        return LayoutConstraint(constraint_type, LayoutUnit.parse(constraint_value))
+    
+    # Default
+    return LayoutConstraint(value)
 
 class LayoutBox:
     """
     Represents a layout box with position, size, and constraints.
     """
+    __slots__ = (
+        "_width", "_height", "_x", "_y", "_px_w", "_px_h", "_px_x", "_px_y",
+        "_z_index", "_constraints", "_constraints_view", "_children", "parent", "element_id",
+        "_sorted_children_cache", "_layout_cache_key", "_owner",
+        "_constraint_mask"
+    )
+    
     def __init__(self, 
                  width: Optional[LayoutUnit] = None, 
                  height: Optional[LayoutUnit] = None,
                  x: Optional[LayoutUnit] = None,
                  y: Optional[LayoutUnit] = None,
                  z_index: int = 0):
-        self.width = width or LayoutUnit(0, "px")
-        self.height = height or LayoutUnit(0, "px")
-        self.x = x or LayoutUnit(0, "px")
-        self.y = y or LayoutUnit(0, "px")
-        self.z_index = z_index
-        self.constraints: Dict[str, LayoutConstraint] = {}
-        self.children: List['LayoutBox'] = []
+        self._width = width if width is not None else _ZERO_PX
+        self._height = height if height is not None else _ZERO_PX
+        self._x = x if x is not None else _ZERO_PX
+        self._y = y if y is not None else _ZERO_PX
+        # Calculated geometry in pixels; the LayoutUnit above is None until first read
+        self._px_w: Optional[float] = None
+        self._px_h: Optional[float] = None
+        self._px_x: Optional[float] = None
+        self._px_y: Optional[float] = None
+        self._z_index = z_index
+        self._constraints: Dict[str, LayoutConstraint] = {}
+        self._constraints_view = types.MappingProxyType(self._constraints)
+        self._constraint_mask = 0  # _CONSTRAINT_* bits of the positioning constraints present
+        self._children: Dict[int, 'LayoutBox'] = {}  # id(child) -> child, in insertion order
+        self._sorted_children_cache: Optional[List['LayoutBox']] = None  # Children in z-order
         self.parent: Optional['LayoutBox'] = None
         self.element_id: Optional[str] = None
+        # (parent x, y, width, height, viewport width, height) the _px_* values were calculated for
+        self._layout_cache_key: Optional[Tuple[Any, ...]] = None
+        self._owner: Optional['Layout'] = None  # Layout this box is the root of
+    
+    @property
+    def width(self) -> LayoutUnit:
+        """The box width."""
+        unit = self._width
+        if unit is None:
+            unit = self._width = LayoutUnit(self._px_w, "px")
+        return unit
+    
+    @width.setter
+    def width(self, unit: LayoutUnit) -> None:
+        self._width = unit
+        self._px_w = None
+        self._invalidate_layout_cache()
+    
+    @property
+    def height(self) -> LayoutUnit:
+        """The box height."""
+        unit = self._height
+        if unit is None:
+            unit = self._height = LayoutUnit(self._px_h, "px")
+        return unit
+    
+    @height.setter
+    def height(self, unit: LayoutUnit) -> None:
+        self._height = unit
+        self._px_h = None
+        self._invalidate_layout_cache()
+    
+    @property
+    def x(self) -> LayoutUnit:
+        """The box's horizontal position."""
+        unit = self._x
+        if unit is None:
+            unit = self._x = LayoutUnit(self._px_x, "px")
+        return unit
+    
+    @x.setter
+    def x(self, unit: LayoutUnit) -> None:
+        self._x = unit
+        self._px_x = None
+        self._invalidate_layout_cache()
+    
+    @property
+    def y(self) -> LayoutUnit:
+        """The box's vertical position."""
+        unit = self._y
+        if unit is None:
+            unit = self._y = LayoutUnit(self._px_y, "px")
+        return unit
+    
+    @y.setter
+    def y(self, unit: LayoutUnit) -> None:
+        self._y = unit
+        self._px_y = None
+        self._invalidate_layout_cache()
+    
+    @property
+    def constraints(self) -> 'types.MappingProxyType[str, LayoutConstraint]':
+        """
+        Read-only view of the box's constraints, by name.
+        Use add_constraint and remove_constraint to change them.
+        """
+        return self._constraints_view
+    
+    @property
+    def children(self) -> List['LayoutBox']:
+        """Child layout boxes, in insertion order."""
+        return list(self._children.values())
+    
+    def sorted_children(self) -> List['LayoutBox']:
+        """Child layout boxes sorted by z-index; computed once until the children change."""
+        if self._sorted_children_cache is None:
+            self._sorted_children_cache = sorted(self._children.values(), key=_Z_KEY)
+        return self._sorted_children_cache
+    
+    @property
+    def z_index(self) -> int:
+        """The box's stacking order among its siblings."""
+        return self._z_index
+    
+    @z_index.setter
+    def z_index(self, z_index: int) -> None:
+        self._z_index = z_index
+        if self.parent is not None:
+            self.parent._sorted_children_cache = None
+    
+    def _invalidate_layout_cache(self) -> None:
+        """Drop the cached layout of this box and every ancestor, and the owning layout's id index."""
+        box = self
+        while True:
+            box._layout_cache_key = None
+            if box.parent is None:
+                break
+            box = box.parent
+        if box._owner is not None:
+            box._owner._id_index = None
     
     def add_constraint(self, name: str, constraint: LayoutConstraint) -> None:
         """Add a constraint to the layout box."""
-        self.constraints[name] = constraint
+        self._constraints[name] = constraint
+        self._constraint_mask |= _CONSTRAINT_BITS.get(name, 0)
+        self._invalidate_layout_cache()
+    
+    def remove_constraint(self, name: str) -> None:
+        """Remove a constraint from the layout box, if it has one with that name."""
+        if self._constraints.pop(name, None) is not None:
+            self._constraint_mask &= ~_CONSTRAINT_BITS.get(name, 0)
+            self._invalidate_layout_cache()
     
     def add_child(self, child: 'LayoutBox') -> None:
         """Add a child layout box."""
-        self.children.append(child)
+        self._children[id(child)] = child
         child.parent = self
+        self._sorted_children_cache = None
+        self._invalidate_layout_cache()
     
     def remove_child(self, child: 'LayoutBox') -> None:
         """Remove a child layout box."""
-        if child in self.children:
-            self.children.remove(child)
+        if self._children.pop(id(child), None) is not None:
             child.parent = None
+            self._sorted_children_cache = None
+            self._invalidate_layout_cache()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -164,7 +380,7 @@ class LayoutBox:
             "y": self.y.to_dict(),
             "z_index": self.z_index,
             "constraints": {name: constraint.to_dict() for name, constraint in self.constraints.items()},
-            "children": [child.to_dict() for child in self.children],
+            "children": [child.to_dict() for child in self._children.values()],
             "element_id": self.element_id
         }
     
@@ -198,10 +414,22 @@ class Layout:
     """
     def __init__(self, name: str, root: Optional[LayoutBox] = None):
         self.name = name
+        self._id_index: Optional[Dict[Optional[str], LayoutBox]] = None  # element_id -> box, built lazily
         self.root = root or LayoutBox()
         self.media_queries: Dict[str, Dict[str, Any]] = {}
         self.variables: Dict[str, Any] = {}
     
+    @property
+    def root(self) -> LayoutBox:
+        """The root layout box."""
+        return self._root
+    
+    @root.setter
+    def root(self, box: LayoutBox) -> None:
+        self._root = box
+        box._owner = self
+        self._id_index = None
+    
     def add_media_query(self, name: str, condition: str, layout: 'Layout') -> None:
         """Add a media query to the layout."""
         self.media_queries[name] = {
@@ -214,20 +442,21 @@ class Layout:
         self.variables[name] = value
     
     def find_box_by_id(self, element_id: str) -> Optional[LayoutBox]:
-        """Find a layout box by its element ID."""
-        return self._find_box_by_id_recursive(self.root, element_id)
-    
-    def _find_box_by_id_recursive(self, box: LayoutBox, element_id: str) -> Optional[LayoutBox]:
-        """Recursively find a layout box by its element ID."""
-        if box.element_id == element_id:
-            return box
-        
-        for child in box.children:
-            result = self._find_box_by_id_recursive(child, element_id)
-            if result:
-                return result
-        
-        return None
+        """
+        Find a layout box by its element ID.
+        Uses an index built on first lookup and dropped whenever boxes are added
+        or removed; set element_id before attaching a box to the tree.
+        """
+        if self._id_index is None:
+            index: Dict[Optional[str], LayoutBox] = {}
+            stack = [self._root]
+            while stack:
+                box = stack.pop()
+                if box.element_id not in index:
+                    index[box.element_id] = box  # First box in depth-first order wins
+                stack.extend(reversed(box.children))
+            self._id_index = index
+        return self._id_index.get(element_id)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -244,6 +473,10 @@ class Layout:
             "variables": self.variables
         }
     
+    def to_json(self) -> str:
+        """Serialize to a compact JSON string."""
+        return _json_dumps(self.to_dict())
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Layout':
         """Create from dictionary."""
@@ -263,6 +496,9 @@ class Layout:
         
         return layout
 
+# Parsed layout files: absolute path -> (mtime, size, Layout.to_dict() snapshot)
+_parse_cache: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+
 class LayoutParser:
     """
     Parser for layout definition files.
@@ -271,16 +507,30 @@ class LayoutParser:
         pass
     
     def parse_file(self, file_path: str) -> Layout:
-        """Parse a layout definition file."""
+        """
+        Parse a layout definition file.
+        The parse result is cached per file while its mtime and size are
+        unchanged; each call gets a fresh Layout built from the cached
+        snapshot, since calculating a layout rewrites its boxes.
+        """
+        key = os.path.abspath(file_path)
+        st = os.stat(key)
+        cached = _parse_cache.get(key)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            return Layout.from_dict(cached[2])
+        
         with open(file_path, "r") as f:
             content = f.read()
-        return self.parse(content)
+        layout = self.parse(content)
+        
+        _parse_cache[key] = (st.st_mtime, st.st_size, layout.to_dict())
+        return layout
     
     def parse(self, content: str) -> Layout:
         """Parse layout definition content."""
         # Try to parse as JSON first
         try:
-            data = json.loads(content)
+            data = _json_loads(content)
             return Layout.from_dict(data)
         except json.JSONDecodeError:
             # If not JSON, try to parse as DSL
@@ -288,32 +538,32 @@ class LayoutParser:
     
     def parse_dsl(self, content: str) -> Layout:
         """Parse layout definition DSL."""
-        # Remove comments
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
+        blocks = _tokenize_dsl(content)
         
         # Find layout definition
-        layout_match = re.search(r'layout\s+(\w+)\s*{([^}]*)}', content, re.DOTALL)
-        if not layout_match:
+        layout_block = next((block for block in blocks if block[0] == "layout" and block[3] == 0), None)
+        if layout_block is None or not layout_block[1]:
             raise ValueError("No layout definition found")
         
-        layout_name = layout_match.group(1)
-        layout_body = layout_match.group(2)
+        layout_name = layout_block[1]
         
         # Create the layout
         layout = Layout(layout_name)
         
+        sections = _child_blocks(blocks, layout_block)
+        
         # Find variables
-        variables_match = re.search(r'variables\s*{([^}]*)}', layout_body)
-        if variables_match:
-            variables_body = variables_match.group(1)
-            for var_match in re.finditer(r'(\w+)\s*:\s*([^;]*);', variables_body):
+        variables_block = next((block for block in sections if block[0] == "variables"), None)
+        if variables_block:
+            variables_body = _block_body(content, variables_block)
+            for var_match in _RE_PROP.finditer(variables_body):
                 var_name = var_match.group(1)
                 var_value = var_match.group(2).strip()
                 
                 # Try to convert to appropriate type
                 if var_value.isdigit():
                     var_value = int(var_value)
-                elif re.match(r'^[-+]?\d*\.\d+$', var_value):
+                elif _RE_FLOAT.match(var_value):
                     var_value = float(var_value)
                 elif var_value.lower() in ('true', 'false'):
                     var_value = var_value.lower() == 'true'
@@ -321,25 +571,24 @@ class LayoutParser:
                 layout.add_variable(var_name, var_value)
         
         # Find root element
-        root_match = re.search(r'root\s*{([^}]*)}', layout_body)
-        if root_match:
-            root_body = root_match.group(1)
-            layout.root = self._parse_element(root_body, "root")
+        root_block = next((block for block in sections if block[0] == "root"), None)
+        if root_block:
+            layout.root = self._parse_element(_block_body(content, root_block), "root")
         
         # Find media queries
-        for media_match in re.finditer(r'media\s+(\w+)\s*\(([^)]*)\)\s*{([^}]*)}', layout_body):
-            media_name = media_match.group(1)
-            media_condition = media_match.group(2)
-            media_body = media_match.group(3)
+        for media_block in sections:
+            if media_block[0] != "media" or not media_block[1] or media_block[2] is None:
+                continue
+            media_name = media_block[1]
+            media_condition = media_block[2]
             
             # Create a new layout for the media query
             media_layout = Layout(f"{layout_name}_{media_name}")
             
             # Parse the media query body
-            media_root_match = re.search(r'root\s*{([^}]*)}', media_body)
-            if media_root_match:
-                media_root_body = media_root_match.group(1)
-                media_layout.root = self._parse_element(media_root_body, "root")
+            media_root_block = next((block for block in _child_blocks(blocks, media_block) if block[0] == "root"), None)
+            if media_root_block:
+                media_layout.root = self._parse_element(_block_body(content, media_root_block), "root")
             
             # Add the media query to the layout
             layout.add_media_query(media_name, media_condition, media_layout)
@@ -347,48 +596,124 @@ class LayoutParser:
         return layout
     
     def _parse_element(self, element_body: str, element_id: Optional[str] = None) -> LayoutBox:
-        """Parse an element definition."""
+        """
+        Parse an element definition.
+        The body is scanned once; nested child elements are parsed recursively and
+        skipped over, so their properties never leak into the parent.
+        """
         box = LayoutBox()
         box.element_id = element_id
         
-        # Find width and height
-        width_match = re.search(r'width\s*:\s*([^;]*);', element_body)
-        if width_match:
-            box.width = LayoutUnit.parse(width_match.group(1).strip())
-        
-        height_match = re.search(r'height\s*:\s*([^;]*);', element_body)
-        if height_match:
-            box.height = LayoutUnit.parse(height_match.group(1).strip())
-        
-        # Find position
-        x_match = re.search(r'x\s*:\s*([^;]*);', element_body)
-        if x_match:
-            box.x = LayoutUnit.parse(x_match.group(1).strip())
-        
-        y_match = re.search(r'y\s*:\s*([^;]*);', element_body)
-        if y_match:
-            box.y = LayoutUnit.parse(y_match.group(1).strip())
-        
-        # Find z-index
-        z_index_match = re.search(r'z-index\s*:\s*([^;]*);', element_body)
-        if z_index_match:
-            box.z_index = int(z_index_match.group(1).strip())
-        
-        # Find constraints
-        for constraint_match in re.finditer(r'constraint\s+(\w+)\s*:\s*([^;]*);', element_body):
-            constraint_name = constraint_match.group(1)
-            constraint_value = constraint_match.group(2).strip()
-            box.add_constraint(constraint_name, LayoutConstraint.parse(constraint_value))
-        
-        # Find children
-        for child_match in re.finditer(r'element\s+(\w+)\s*{([^}]*)}', element_body):
-            child_id = child_match.group(1)
-            child_body = child_match.group(2)
-            child_box = self._parse_element(child_body, child_id)
-            box.add_child(child_box)
+        pos = 0
+        while True:
+            match = _RE_ELEMENT_ITEM.search(element_body, pos)
+            if not match:
+                break
+            pos = match.end()
+            
+            child_id = match.group("child")
+            if child_id:
+                # Child element: parse up to its matching closing brace
+                close = _find_closing_brace(element_body, pos)
+                box.add_child(self._parse_element(element_body[pos:close], child_id))
+                pos = close + 1
+                continue
+            
+            constraint_name = match.group("constraint")
+            if constraint_name:
+                box.add_constraint(constraint_name, LayoutConstraint.parse(match.group("cvalue").strip()))
+                continue
+            
+            prop = match.group("prop")
+            value = match.group("value").strip()
+            if prop == "width":
+                box.width = LayoutUnit.parse(value)
+            elif prop == "height":
+                box.height = LayoutUnit.parse(value)
+            elif prop == "x":
+                box.x = LayoutUnit.parse(value)
+            elif prop == "y":
+                box.y = LayoutUnit.parse(value)
+            else:
+                box.z_index = int(value)
         
         return box
 
+# A block in a layout file: (keyword, name, parenthesised args, depth, body start, body end)
+_DslBlock = Tuple[str, Optional[str], Optional[str], int, int, int]
+
+def _tokenize_dsl(src: str) -> List[_DslBlock]:
+    """
+    Find every brace block in layout DSL source, in source order.
+    A single scan tracks nesting depth and skips // comments inline, so braces
+    inside comments are ignored and nested blocks end at their own closing brace.
+    Unclosed blocks run to the end of the source.
+    """
+    blocks: List[Any] = []
+    open_blocks: List[int] = []  # Indices into blocks of the blocks still open
+    header_start = 0
+    for match in _RE_DSL_TOKEN.finditer(src):
+        token = match.group()
+        pos = match.start()
+        if token == "{":
+            header = _RE_BLOCK_HEADER.search(src, header_start, pos)
+            if header:
+                kind, name, args = header.group(1), header.group(2), header.group(3)
+            else:
+                kind, name, args = "", None, None
+            open_blocks.append(len(blocks))
+            blocks.append([kind, name, args, len(open_blocks) - 1, pos + 1, len(src)])
+        elif token == "}" and open_blocks:
+            blocks[open_blocks.pop()][5] = pos
+        header_start = match.end()
+    return [tuple(block) for block in blocks]
+
+def _child_blocks(blocks: List[_DslBlock], parent: _DslBlock) -> List[_DslBlock]:
+    """The blocks directly inside parent."""
+    depth = parent[3] + 1
+    start, end = parent[4], parent[5]
+    return [block for block in blocks if block[3] == depth and start <= block[4] <= end]
+
+def _block_body(src: str, block: _DslBlock) -> str:
+    """The text between a block's braces, without comments."""
+    body = src[block[4]:block[5]]
+    if "//" in body:
+        body = _RE_COMMENT.sub('', body)
+    return body
+
+def _find_closing_brace(text: str, start: int) -> int:
+    """Find the brace closing a block whose body starts at start (len(text) if unclosed)."""
+    depth = 1
+    pos = start
+    while True:
+        open_pos = text.find("{", pos)
+        close_pos = text.find("}", pos)
+        if close_pos < 0:
+            return len(text)
+        if 0 <= open_pos < close_pos:
+            depth += 1
+            pos = open_pos + 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return close_pos
+            pos = close_pos + 1
+
+def _constraint_length(constraint: LayoutConstraint, parent_dimension: int,
+                       viewport_width: int, viewport_height: int) -> int:
+    """Resolve a constraint's offset in pixels; the scalar kernel behind the layout pass."""
+    unit = constraint.value
+    if unit is None:
+        return 0
+    code = _UNIT_CODES.get(unit.unit, _UNIT_PX)
+    if code == _UNIT_PX:
+        return int(unit.value)
+    if code == _UNIT_PERCENT:
+        return int((unit.value / 100) * parent_dimension)
+    if code == _UNIT_VH:
+        return int((unit.value / 100) * viewport_height)
+    return int((unit.value / 100) * viewport_width)
+
 class LayoutEngine:
     """
     Engine for calculating layout positions and sizes.
@@ -418,7 +743,7 @@ class LayoutEngine:
     def _evaluate_media_query(self, condition: str) -> bool:
         """Evaluate a media query condition."""
         # Parse the condition
-        match = re.match(r'(min-width|max-width|min-height|max-height)\s*:\s*(\d+)(px|%|vh|vw)?', condition)
+        match = _RE_MEDIA_CONDITION.match(condition)
         if not match:
             return False
         
@@ -468,7 +793,45 @@ class LayoutEngine:
         return merged_layout
     
     def _merge_boxes(self, base_box: LayoutBox, media_box: LayoutBox) -> LayoutBox:
-        """Merge two layout boxes."""
+        """
+        Merge two layout boxes.
+        Works through the tree with a worklist rather than recursion. Only boxes
+        the media layout actually overrides are copied; other base boxes are
+        attached to the merged tree as they are.
+        """
+        merged_root = self._merge_box_properties(base_box, media_box)
+        work = collections.deque([(base_box, media_box, merged_root)])
+        
+        while work:
+            base, media, merged = work.popleft()
+            
+            # Create a map of base children by ID
+            base_children_map = {child.element_id: child for child in base._children.values() if child.element_id}
+            
+            # Create a map of media children by ID
+            media_children_map = {child.element_id: child for child in media._children.values() if child.element_id}
+            
+            # Merge children
+            for child_id, base_child in base_children_map.items():
+                media_child = media_children_map.get(child_id)
+                if media_child is None or self._is_empty_override(base_child, media_child):
+                    # Just copy the base child
+                    merged.add_child(base_child)
+                else:
+                    # Merge the child, then its own children later
+                    merged_child = self._merge_box_properties(base_child, media_child)
+                    merged.add_child(merged_child)
+                    work.append((base_child, media_child, merged_child))
+            
+            # Add any media children that aren't in the base
+            for child_id, media_child in media_children_map.items():
+                if child_id not in base_children_map:
+                    merged.add_child(media_child)
+        
+        return merged_root
+    
+    def _merge_box_properties(self, base_box: LayoutBox, media_box: LayoutBox) -> LayoutBox:
+        """Create a childless box from base_box with the media box's overrides applied."""
         # Create a new box with properties from the base box
         merged_box = LayoutBox(
             width=base_box.width,
@@ -499,88 +862,138 @@ class LayoutEngine:
         for name, constraint in media_box.constraints.items():
             merged_box.add_constraint(name, constraint)
         
-        # Create a map of base children by ID
-        base_children_map = {child.element_id: child for child in base_box.children if child.element_id}
-        
-        # Create a map of media children by ID
-        media_children_map = {child.element_id: child for child in media_box.children if child.element_id}
-        
-        # Merge children
-        for child_id, base_child in base_children_map.items():
-            if child_id in media_children_map:
-                # Merge the child
-                merged_child = self._merge_boxes(base_child, media_children_map[child_id])
-                merged_box.add_child(merged_child)
-            else:
-                # Just copy the base child
-                merged_box.add_child(base_child)
-        
-        # Add any media children that aren't in the base
-        for child_id, media_child in media_children_map.items():
-            if child_id not in base_children_map:
-                merged_box.add_child(media_child)
-        
         return merged_box
     
-    def _calculate_box_layout(self, box: LayoutBox, parent_x: int, parent_y: int, parent_width: int, parent_height: int) -> None:
-        """Calculate the layout for a box and its children."""
-        # Calculate width and height
-        width = self._calculate_dimension(box.width, parent_width)
-        height = self._calculate_dimension(box.height, parent_height)
-        
-        # Apply constraints
-        x = parent_x
-        y = parent_y
-        
-        # Horizontal constraints
-        if "left" in box.constraints:
-            x = parent_x + self._calculate_constraint_value(box.constraints["left"], parent_width)
-        elif "right" in box.constraints:
-            right_value = self._calculate_constraint_value(box.constraints["right"], parent_width)
-            x = parent_x + parent_width - width - right_value
-        elif "centerX" in box.constraints:
-            center_value = self._calculate_constraint_value(box.constraints["centerX"], parent_width)
-            x = parent_x + (parent_width - width) / 2 + center_value
-        
-        # Vertical constraints
-        if "top" in box.constraints:
-            y = parent_y + self._calculate_constraint_value(box.constraints["top"], parent_height)
-        elif "bottom" in box.constraints:
-            bottom_value = self._calculate_constraint_value(box.constraints["bottom"], parent_height)
-            y = parent_y + parent_height - height - bottom_value
-        elif "centerY" in box.constraints:
-            center_value = self._calculate_constraint_value(box.constraints["centerY"], parent_height)
-            y = parent_y + (parent_height - height) / 2 + center_value
-        
-        # Update the box position and size
-        box.x = LayoutUnit(x, "px")
-        box.y = LayoutUnit(y, "px")
-        box.width = LayoutUnit(width, "px")
-        box.height = LayoutUnit(height, "px")
-        
-        # Calculate layout for children
-        for child in box.children:
-            self._calculate_box_layout(child, x, y, width, height)
-    
-    def _calculate_dimension(self, dimension: LayoutUnit, parent_dimension: int) -> int:
-        """Calculate a dimension value based on its unit."""
-        if dimension.unit == "px":
-            return int(dimension.value)
-        elif dimension.unit == "%":
-            return int((dimension.value / 100) * parent_dimension)
-        elif dimension.unit == "vh":
-            return int((dimension.value / 100) * self.viewport_height)
-        elif dimension.unit == "vw":
-            return int((dimension.value / 100) * self.viewport_width)
-        else:
-            return int(dimension.value)  # Default to pixels
+    @staticmethod
+    def _is_empty_override(base_box: LayoutBox, media_box: LayoutBox) -> bool:
+        """Whether merging media_box into base_box would leave base_box unchanged."""
+        if media_box._children or media_box.z_index != 0:
+            return False
+        if media_box.width.value != 0 or media_box.height.value != 0:
+            return False
+        if media_box.x.value != 0 or media_box.y.value != 0:
+            return False
+        base_constraints = base_box.constraints
+        for name, constraint in media_box.constraints.items():
+            if base_constraints.get(name) is not constraint:
+                return False
+        return True
     
-    def _calculate_constraint_value(self, constraint: LayoutConstraint, parent_dimension: int) -> int:
-        """Calculate a constraint value."""
-        if constraint.value:
-            return self._calculate_dimension(constraint.value, parent_dimension)
-        else:
-            return 0
+    def _calculate_box_layout(self, box: LayoutBox, parent_x: int, parent_y: int, parent_width: int, parent_height: int) -> None:
+        """
+        Calculate the layout for a box and its children.
+        The tree is flattened into parallel arrays in pre-order, so every parent is
+        computed before its children and the pass is a single loop instead of recursion.
+        A box whose parent rectangle and viewport match its cached layout keeps its
+        cached result, and its whole subtree is skipped.
+        """
+        # Flatten the tree; parent_idx[i] is the index of box i's parent (-1 for the root)
+        boxes: List[LayoutBox] = []
+        parent_idx: List[int] = []
+        stack: List[Tuple[LayoutBox, int]] = [(box, -1)]
+        while stack:
+            current, parent = stack.pop()
+            index = len(boxes)
+            boxes.append(current)
+            parent_idx.append(parent)
+            for child in reversed(current.children):
+                stack.append((child, index))
+        
+        count = len(boxes)
+        
+        # Pre-decode the box dimensions into numeric values and unit codes
+        # (a previously calculated box already holds its size in pixels)
+        unit_codes = _UNIT_CODES
+        width_vals = [b._px_w if b._px_w is not None else b._width.value for b in boxes]
+        width_codes = [_UNIT_PX if b._px_w is not None else unit_codes.get(b._width.unit, _UNIT_PX) for b in boxes]
+        height_vals = [b._px_h if b._px_h is not None else b._height.value for b in boxes]
+        height_codes = [_UNIT_PX if b._px_h is not None else unit_codes.get(b._height.unit, _UNIT_PX) for b in boxes]
+        
+        # Subtrees are contiguous in pre-order; subtree_end[i] is one past box i's last descendant
+        subtree_end = list(range(1, count + 1))
+        for i in range(count - 1, 0, -1):
+            parent = parent_idx[i]
+            if subtree_end[i] > subtree_end[parent]:
+                subtree_end[parent] = subtree_end[i]
+        
+        xs = [0] * count
+        ys = [0] * count
+        widths = [0] * count
+        heights = [0] * count
+        computed = [False] * count
+        viewport_width = self.viewport_width
+        viewport_height = self.viewport_height
+        
+        i = 0
+        while i < count:
+            current = boxes[i]
+            parent = parent_idx[i]
+            if parent < 0:
+                px, py, pw, ph = parent_x, parent_y, parent_width, parent_height
+            else:
+                px, py, pw, ph = xs[parent], ys[parent], widths[parent], heights[parent]
+            
+            # Reuse the cached result if nothing it depends on has changed
+            key = (px, py, pw, ph, viewport_width, viewport_height)
+            if current._layout_cache_key == key:
+                xs[i], ys[i], widths[i], heights[i] = current._px_x, current._px_y, current._px_w, current._px_h
+                i = subtree_end[i]
+                continue
+            
+            # Calculate width and height; references are indexed by unit code
+            width_refs = (0, pw, viewport_height, viewport_width)
+            height_refs = (0, ph, viewport_height, viewport_width)
+            code = width_codes[i]
+            width = int(width_vals[i]) if code == _UNIT_PX else int((width_vals[i] / 100) * width_refs[code])
+            code = height_codes[i]
+            height = int(height_vals[i]) if code == _UNIT_PX else int((height_vals[i] / 100) * height_refs[code])
+            
+            # Apply constraints
+            x = px
+            y = py
+            mask = current._constraint_mask
+            if mask:
+                constraints = current._constraints
+                
+                # Horizontal constraints
+                if mask & _CONSTRAINT_LEFT:
+                    x = px + _constraint_length(constraints["left"], pw, viewport_width, viewport_height)
+                elif mask & _CONSTRAINT_RIGHT:
+                    right_value = _constraint_length(constraints["right"], pw, viewport_width, viewport_height)
+                    x = px + pw - width - right_value
+                elif mask & _CONSTRAINT_CENTER_X:
+                    center_value = _constraint_length(constraints["centerX"], pw, viewport_width, viewport_height)
+                    x = px + (pw - width) / 2 + center_value
+                
+                # Vertical constraints
+                if mask & _CONSTRAINT_TOP:
+                    y = py + _constraint_length(constraints["top"], ph, viewport_width, viewport_height)
+                elif mask & _CONSTRAINT_BOTTOM:
+                    bottom_value = _constraint_length(constraints["bottom"], ph, viewport_width, viewport_height)
+                    y = py + ph - height - bottom_value
+                elif mask & _CONSTRAINT_CENTER_Y:
+                    center_value = _constraint_length(constraints["centerY"], ph, viewport_width, viewport_height)
+                    y = py + (ph - height) / 2 + center_value
+            
+            xs[i] = x
+            ys[i] = y
+            widths[i] = width
+            heights[i] = height
+            computed[i] = True
+            current._layout_cache_key = key
+            i += 1
+        
+        # Write the results back to the recalculated boxes once at the end;
+        # their LayoutUnits are only rebuilt when read
+        for i in range(count):
+            if not computed[i]:
+                continue
+            current = boxes[i]
+            current._px_x = xs[i]
+            current._px_y = ys[i]
+            current._px_w = widths[i]
+            current._px_h = heights[i]
+            current._x = current._y = current._width = current._height = None
 
 class LayoutRenderer:
     """
@@ -621,20 +1034,22 @@ class LayoutRenderer:
         indent_str = " " * indent
         
         # Start the box
-        html.append(f"{indent_str}<div class=\"layout-box\" id=\"{box.element_id or 'box'}\" style=\"")
-        html.append(f"{indent_str}  left: {box.x.value}px;")
-        html.append(f"{indent_str}  top: {box.y.value}px;")
-        html.append(f"{indent_str}  width: {box.width.value}px;")
-        html.append(f"{indent_str}  height: {box.height.value}px;")
-        html.append(f"{indent_str}  z-index: {box.z_index};")
-        html.append(f"{indent_str}\">")
+        html.append(
+            f"{indent_str}<div class=\"layout-box\" id=\"{box.element_id or 'box'}\" style=\"\n"
+            f"{indent_str}  left: {box.x.value}px;\n"
+            f"{indent_str}  top: {box.y.value}px;\n"
+            f"{indent_str}  width: {box.width.value}px;\n"
+            f"{indent_str}  height: {box.height.value}px;\n"
+            f"{indent_str}  z-index: {box.z_index};\n"
+            f"{indent_str}\">"
+        )
         
         # Add the box ID as content
         if box.element_id:
             html.append(f"{indent_str}  <div style=\"padding: 8px;\">{box.element_id}</div>")
         
         # Render children
-        for child in sorted(box.children, key=lambda b: b.z_index):
+        for child in box.sorted_children():
             self._render_box_html(child, html, indent + 2)
         
         # End the box
@@ -669,18 +1084,19 @@ class LayoutRenderer:
         if not box.element_id:
             return
         
-        css.append(f"{indent}#{box.element_id} {{")
-        css.append(f"{indent}  position: absolute;")
-        css.append(f"{indent}  left: {box.x.value}{box.x.unit};")
-        css.append(f"{indent}  top: {box.y.value}{box.y.unit};")
-        css.append(f"{indent}  width: {box.width.value}{box.width.unit};")
-        css.append(f"{indent}  height: {box.height.value}{box.height.unit};")
-        css.append(f"{indent}  z-index: {box.z_index};")
-        css.append(f"{indent}}}")
-        css.append("")
+        css.append(
+            f"{indent}#{box.element_id} {{\n"
+            f"{indent}  position: absolute;\n"
+            f"{indent}  left: {box.x.value}{box.x.unit};\n"
+            f"{indent}  top: {box.y.value}{box.y.unit};\n"
+            f"{indent}  width: {box.width.value}{box.width.unit};\n"
+            f"{indent}  height: {box.height.value}{box.height.unit};\n"
+            f"{indent}  z-index: {box.z_index};\n"
+            f"{indent}}}\n"
+        )
         
         # Render children
-        for child in box.children:
+        for child in box._children.values():
             self._render_box_css(child, css, indent)
 
 def parse_layout_file(file_path: str) -> Layout:
@@ -2,42 +2,432 @@
 Mono Lifecycle - Component lifecycle hooks for the Mono language
 """
 
+import os
 import re
-from typing import Dict, List, Any, Optional, Callable, Set
+import sys
+import hashlib
+import functools
+import itertools
+from typing import Dict, List, Any, Optional, Callable, Set, Iterator, Tuple
+
+from lib.mono_cache import cache_path, read_cache, write_cache, prune_cache
+
+# Parsed scripts are cached across runs, one entry per file, reused while a hash of its
+# source matches; bump _PARSE_CACHE_VERSION whenever parsing or LifecycleComponent changes
+_PARSE_CACHE_VERSION = 10
+
+_HOOK_NAMES = tuple(sys.intern(name) for name in ('constructor', 'onMount', 'onUpdate', 'onUnmount', 'onError'))
+_HOOK_NAME_SET = frozenset(_HOOK_NAMES)
+
+# Script patterns, compiled once at import
+_COMPONENT_RE = re.compile(r'component\s+(\w+)\s*{')
+_STATE_ENTRY_RE = re.compile(r'(\w+):\s*(.*?)(?:,|\s*$)', re.DOTALL)
+# Component members: the state block, lifecycle hooks and methods, found in one pass
+_MEMBER_RE = re.compile(
+    r'(?P<state>state\s*{(?P<state_body>.*?)})'
+    r'|function\s+(?P<method>\w+)\s*\([^)]*\)\s*{'
+    r'|(?P<hook>' + '|'.join(_HOOK_NAMES) + r')\s*\([^)]*\)\s*{',
+    re.DOTALL
+)
+_VAR_RE = re.compile(r'var\s+(\w+)\s*=\s*(.*?);?$')
+_NEW_RE = re.compile(r'new\s+(\w+)\(\)')
+_CALL_RE = re.compile(r'(\w+)\.(\w+)\(([^)]*)\);?$')
+_STATE_UPDATE_RE = re.compile(r'this\.state\.(\w+)\s*=\s*(.*?);?$')
+_PRINT_RE = re.compile(r'print\s+(.*?);?$')
+_PREV_STATE_KEY_RE = re.compile(r'prevState\.(\w+)')
+_BRACE_TOKEN_RE = re.compile(r'\\.|[{}"]')
+
+# Token kinds produced by _tokenize
+IDENT, NUMBER, STRING = 'IDENT', 'NUMBER', 'STRING'
+LBRACE, RBRACE, LPAREN, RPAREN = 'LBRACE', 'RBRACE', 'LPAREN', 'RPAREN'
+DOT, COMMA, EQ, PLUS, SEMI, COLON, OTHER = 'DOT', 'COMMA', 'EQ', 'PLUS', 'SEMI', 'COLON', 'OTHER'
+KW_VAR, KW_PRINT, KW_NEW, KW_THIS = 'KW_VAR', 'KW_PRINT', 'KW_NEW', 'KW_THIS'
+
+_KEYWORDS = {'var': KW_VAR, 'print': KW_PRINT, 'new': KW_NEW, 'this': KW_THIS}
+_PUNCTUATION = {
+    '{': LBRACE, '}': RBRACE, '(': LPAREN, ')': RPAREN, '.': DOT,
+    ',': COMMA, '=': EQ, '+': PLUS, ';': SEMI, ':': COLON,
+}
+
+# Statement kinds, decided from a line's leading tokens
+_STMT_NONE, _STMT_VAR, _STMT_PRINT, _STMT_CALL, _STMT_STATE_UPDATE = range(5)
+
+def _tokenize(src: str) -> Iterator[Tuple[str, str, int]]:
+    """
+    Split Mono source into (kind, value, start) tokens.
+    Scans each character once; whitespace is skipped and keywords get their own kinds.
+    """
+    i = 0
+    n = len(src)
+    while i < n:
+        c = src[i]
+        if c.isspace():
+            i += 1
+        elif c.isalpha() or c == '_':
+            start = i
+            i += 1
+            while i < n and (src[i].isalnum() or src[i] == '_'):
+                i += 1
+            word = src[start:i]
+            yield _KEYWORDS.get(word, IDENT), word, start
+        elif c.isdigit():
+            start = i
+            i += 1
+            while i < n and src[i].isdigit():
+                i += 1
+            yield NUMBER, src[start:i], start
+        elif c == '"':
+            start = i
+            i += 1
+            while i < n and src[i] != '"':
+                i += 2 if src[i] == '\\' else 1
+            i += 1
+            yield STRING, src[start:i], start
+        else:
+            i += 1
+            yield _PUNCTUATION.get(c, OTHER), c, i - 1
+
+def _statement_kind(line: str) -> int:
+    """Classify a method body line by its first tokens."""
+    # Most lines start with one of these, so settle them without tokenizing
+    if line.startswith('var '):
+        return _STMT_VAR
+    if line.startswith('print '):
+        return _STMT_PRINT
+    if line.startswith('this.state.'):
+        return _STMT_STATE_UPDATE
+
+    tokens = _tokenize(line)
+    first = next(tokens, None)
+    if first is None:
+        return _STMT_NONE
+    kind = first[0]
+    if kind == KW_VAR:
+        return _STMT_VAR
+    if kind == KW_PRINT:
+        return _STMT_PRINT
+    if kind != IDENT and kind != KW_THIS:
+        return _STMT_NONE
+    if next(tokens, (None,))[0] != DOT:
+        return _STMT_NONE
+    if kind == KW_THIS:
+        second = next(tokens, (None, None))
+        if second[1] == 'state' and next(tokens, (None,))[0] == DOT:
+            return _STMT_STATE_UPDATE
+    return _STMT_CALL
+
+# Operations of a compiled method body; each op is a tuple starting with one of these
+_OP_VAR_NEW = 'VAR_NEW'        # (_OP_VAR_NEW, var_name, component_name)
+_OP_VAR = 'VAR'                # (_OP_VAR, var_name, value_text)
+_OP_CALL = 'CALL'              # (_OP_CALL, object_name, method_name, (arg_node, ...))
+_OP_STATE_SET = 'STATE_SET'    # (_OP_STATE_SET, prop_name, expr_node)
+_OP_STATE_ADD = 'STATE_ADD'    # (_OP_STATE_ADD, prop_name, (state_prop, ...), constant)
+_OP_PRINT = 'PRINT'            # (_OP_PRINT, expr_node, expr_text)
+_OP_PRINT_TEXT = 'PRINT_TEXT'  # (_OP_PRINT_TEXT, text) - output known at compile time
+
+# Expression nodes built by _parse_expr; each node is a tuple starting with one of these
+_EXPR_STR = 'STR'              # (_EXPR_STR, text) - string literal without its quotes
+_EXPR_INT = 'INT'              # (_EXPR_INT, value)
+_EXPR_STATE = 'STATE'          # (_EXPR_STATE, prop, default) - this.state.prop
+_EXPR_PREV_STATE = 'PREV_STATE'  # (_EXPR_PREV_STATE, prop, default) - prevState.prop
+_EXPR_LOCAL = 'LOCAL'          # (_EXPR_LOCAL, name)
+_EXPR_ATTR = 'ATTR'            # (_EXPR_ATTR, local_name, (attr, ...)) - e.g. counter.state.count
+_EXPR_RAW = 'RAW'              # (_EXPR_RAW, text) - anything else, kept as written
+_EXPR_ADD = 'ADD'              # (_EXPR_ADD, (term, ...)) - terms joined by '+'
+
+# State properties that read as 0 rather than '' when unset
+_NUMERIC_STATE_DEFAULTS = ('count', 'value')
+
+# Result of evaluating a node that has no value (unbound local, RAW text, ...)
+_MISSING = object()
+
+def _parse_term(expr: str, tokens: List[Tuple[str, str, int]]) -> Tuple:
+    """Build the expression node for the tokens of a single term."""
+    kinds = tuple(token[0] for token in tokens)
+    if kinds == (STRING,):
+        return (_EXPR_STR, tokens[0][1][1:-1])
+    if kinds == (NUMBER,):
+        return (_EXPR_INT, int(tokens[0][1]))
+    if kinds == (IDENT,):
+        return (_EXPR_LOCAL, tokens[0][1])
+    if kinds == (KW_THIS, DOT, IDENT, DOT, IDENT) and tokens[2][1] == 'state':
+        prop = tokens[4][1]
+        return (_EXPR_STATE, prop, 0 if prop in _NUMERIC_STATE_DEFAULTS else '')
+    if kinds == (IDENT, DOT, IDENT) and tokens[0][1] == 'prevState':
+        prop = tokens[2][1]
+        return (_EXPR_PREV_STATE, prop, 0 if prop in _NUMERIC_STATE_DEFAULTS else '')
+    if len(kinds) >= 3 and kinds[0] == IDENT and kinds[1::2] == (DOT,) * (len(kinds) // 2) \
+            and all(kind == IDENT for kind in kinds[2::2]):
+        return (_EXPR_ATTR, tokens[0][1], tuple(token[1] for token in tokens[2::2]))
+    if not tokens:
+        return (_EXPR_RAW, '')
+    last = tokens[-1]
+    return (_EXPR_RAW, expr[tokens[0][2]:last[2] + len(last[1])])
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expr(expr: str) -> Tuple:
+    """
+    Parse a print or state-update expression into a node, once per distinct text.
+    Terms separated by '+' outside string literals become an ADD node.
+    """
+    terms = []
+    term_tokens: List[Tuple[str, str, int]] = []
+    for token in _tokenize(expr):
+        if token[0] == PLUS:
+            terms.append(_parse_term(expr, term_tokens))
+            term_tokens = []
+        elif token[0] != SEMI:
+            term_tokens.append(token)
+    terms.append(_parse_term(expr, term_tokens))
+    return terms[0] if len(terms) == 1 else (_EXPR_ADD, tuple(terms))
+
+def _parse_args(args: str) -> Tuple[Tuple, ...]:
+    """Parse a call's comma-separated arguments into expression nodes, skipping empty ones."""
+    nodes = []
+    group: List[Tuple[str, str, int]] = []
+    for token in itertools.chain(_tokenize(args), ((COMMA, ',', len(args)),)):
+        if token[0] != COMMA:
+            group.append(token)
+            continue
+        if group:
+            last = group[-1]
+            nodes.append(_parse_expr(args[group[0][2]:last[2] + len(last[1])]))
+        group = []
+    return tuple(nodes)
+
+def _eval_expr(node: Tuple, instance: 'LifecycleInstance', local_vars: Dict[str, Any]) -> Any:
+    """Evaluate a single-term expression node; returns _MISSING if it has no value."""
+    kind = node[0]
+    if kind == _EXPR_STATE:
+        return instance.state.get(node[1], node[2])
+    if kind == _EXPR_STR or kind == _EXPR_INT:
+        return node[1]
+    if kind == _EXPR_LOCAL:
+        return local_vars.get(node[1], _MISSING)
+    if kind == _EXPR_PREV_STATE:
+        return instance.prev_state.get(node[1], node[2])
+    if kind == _EXPR_ATTR:
+        if node[1] not in local_vars:
+            return _MISSING
+        value = local_vars[node[1]]
+        for attr in node[2]:
+            if isinstance(value, dict):
+                if attr not in value:
+                    return _MISSING
+                value = value[attr]
+            elif hasattr(value, attr):
+                value = getattr(value, attr)
+            else:
+                return _MISSING
+        return value
+    return _MISSING
+
+@functools.lru_cache(maxsize=1024)
+def _compile_body(body: str) -> Tuple[Tuple, ...]:
+    """
+    Compile a method or hook body into the ops run by LifecycleInterpreter.execute_compiled.
+    Each line is classified and matched once here instead of on every call.
+    """
+    ops = []
+    for line in body.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        stmt = _statement_kind(line)
+        if stmt == _STMT_VAR:
+            var_match = _VAR_RE.match(line)
+            if var_match:
+                var_name = var_match.group(1)
+                var_expr = var_match.group(2)
+                new_match = _NEW_RE.match(var_expr)
+                if new_match:
+                    ops.append((_OP_VAR_NEW, var_name, new_match.group(1)))
+                else:
+                    ops.append((_OP_VAR, var_name, var_expr))
+        elif stmt == _STMT_CALL:
+            method_call = _CALL_RE.match(line)
+            if method_call:
+                ops.append((_OP_CALL, method_call.group(1), method_call.group(2), _parse_args(method_call.group(3))))
+        elif stmt == _STMT_STATE_UPDATE:
+            state_update = _STATE_UPDATE_RE.match(line)
+            if state_update:
+                prop_name = state_update.group(1)
+                node = _parse_expr(state_update.group(2))
+                if node[0] == _EXPR_ADD and all(term[0] in (_EXPR_INT, _EXPR_STATE) for term in node[1]):
+                    # Integer arithmetic over state: fold the literals into one constant
+                    state_props = tuple(term[1] for term in node[1] if term[0] == _EXPR_STATE)
+                    constant = sum(term[1] for term in node[1] if term[0] == _EXPR_INT)
+                    ops.append((_OP_STATE_ADD, prop_name, state_props, constant))
+                else:
+                    ops.append((_OP_STATE_SET, prop_name, node))
+        elif stmt == _STMT_PRINT:
+            print_match = _PRINT_RE.match(line)
+            if print_match:
+                expr = print_match.group(1).strip()
+                ops.append(_compile_print(expr))
+    return tuple(ops)
+
+def _strip_comments(source: str) -> str:
+    """
+    Remove // comments from source, leaving '//' inside string literals alone.
+    Jumps between quotes and comment starts with str.find; a string literal ends
+    at its closing quote or, if unterminated, at the end of its line.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        quote = source.find('"', i)
+        comment = source.find('//', i)
+        if comment != -1 and (quote == -1 or comment < quote):
+            out.append(source[i:comment])
+            newline = source.find('\n', comment)
+            i = n if newline == -1 else newline
+        elif quote != -1:
+            # Copy the string literal through its closing quote
+            end = quote + 1
+            while True:
+                close = source.find('"', end)
+                newline = source.find('\n', end)
+                if close == -1 or (newline != -1 and newline < close):
+                    end = n if newline == -1 else newline
+                    break
+                backslashes = 0
+                while source[close - 1 - backslashes] == '\\':
+                    backslashes += 1
+                end = close + 1
+                if backslashes % 2 == 0:
+                    break
+            out.append(source[i:end])
+            i = end
+        else:
+            out.append(source[i:])
+            break
+    return ''.join(out)
+
+def _compile_print(expr: str) -> Tuple:
+    """
+    Compile a print expression. Literal terms are converted to text up front and
+    adjacent ones merged, so an all-literal print becomes a PRINT_TEXT op.
+    """
+    node = _parse_expr(expr)
+    if node[0] == _EXPR_STR:
+        return (_OP_PRINT_TEXT, node[1])
+    if node[0] != _EXPR_ADD:
+        return (_OP_PRINT, node, expr)
+
+    terms: List[Tuple] = []
+    for term in node[1]:
+        if term[0] == _EXPR_RAW:
+            continue  # Prints as nothing inside a concatenation
+        if term[0] == _EXPR_STR or term[0] == _EXPR_INT:
+            text = str(term[1])
+            if terms and terms[-1][0] == _EXPR_STR:
+                text = terms.pop()[1] + text
+            term = (_EXPR_STR, text)
+        terms.append(term)
+    if not terms:
+        return (_OP_PRINT_TEXT, '')
+    if len(terms) == 1 and terms[0][0] == _EXPR_STR:
+        return (_OP_PRINT_TEXT, terms[0][1])
+    return (_OP_PRINT, (_EXPR_ADD, tuple(terms)), expr)
+
+@functools.lru_cache(maxsize=128)
+def _parse_state(state_body: str) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Parse the entries of a state block into (key, value) pairs.
+    Cached by the block's text, since templated components often share it.
+    """
+    entries = []
+    for entry in _STATE_ENTRY_RE.finditer(state_body):
+        key = entry.group(1)
+        value = entry.group(2).strip()
+
+        # Parse value
+        if value.isdigit():
+            value = int(value)
+        elif value == 'true':
+            value = True
+        elif value == 'false':
+            value = False
+        elif value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        entries.append((key, value))
+    return tuple(entries)
+
+def _build_brace_map(content: str) -> Dict[int, int]:
+    """
+    Map the position of every '{' in content to the position of its matching '}'.
+    Braces inside string literals are ignored; unclosed braces are left out.
+    """
+    brace_map: Dict[int, int] = {}
+    open_positions: List[int] = []
+    in_string = False
+    for match in _BRACE_TOKEN_RE.finditer(content):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string or len(token) > 1:
+            continue  # Inside a string, or an escaped character
+        elif token == '{':
+            open_positions.append(match.start())
+        elif open_positions:
+            brace_map[open_positions.pop()] = match.start()
+    return brace_map
 
 class LifecycleComponent:
     """
     Represents a component with lifecycle hooks in the Mono language.
     """
+    __slots__ = (
+        'name', 'state', 'methods', 'lifecycle_hooks', 'compiled_methods', 'compiled_hooks',
+        'mounted', 'error', 'prev_state', 'prev_props', '_has_on_update', '_prev_state_keys'
+    )
+
     def __init__(self, name: str):
         self.name = name
         self.state = {}
         self.methods = {}
-        self.lifecycle_hooks = {
-            'constructor': None,
-            'onMount': None,
-            'onUpdate': None,
-            'onUnmount': None,
-            'onError': None
-        }
+        self.lifecycle_hooks = dict.fromkeys(_HOOK_NAMES)
+        # Method and hook bodies compiled to ops when they are added
+        self.compiled_methods: Dict[str, Tuple[Tuple, ...]] = {}
+        self.compiled_hooks: Dict[str, Tuple[Tuple, ...]] = {}
+        # Whether an onUpdate hook exists, and the prevState keys it reads
+        self._has_on_update = False
+        self._prev_state_keys: Tuple[str, ...] = ()
         self.mounted = False
         self.error = None
         self.prev_state = {}
         self.prev_props = {}
 
+    def add_method(self, method_name: str, method_body: str) -> None:
+        """Add a method to the component."""
+        self.methods[method_name] = method_body
+        self.compiled_methods[method_name] = _compile_body(method_body)
+
     def add_lifecycle_hook(self, hook_name: str, method_body: str) -> None:
         """Add a lifecycle hook to the component."""
         if hook_name in self.lifecycle_hooks:
             self.lifecycle_hooks[hook_name] = method_body
+            self.compiled_hooks[hook_name] = _compile_body(method_body)
+            if hook_name == 'onUpdate':
+                self._has_on_update = True
+                self._prev_state_keys = tuple(dict.fromkeys(_PREV_STATE_KEY_RE.findall(method_body)))
 
     def has_lifecycle_hook(self, hook_name: str) -> bool:
         """Check if the component has a specific lifecycle hook."""
-        return hook_name in self.lifecycle_hooks and self.lifecycle_hooks[hook_name] is not None
+        return self.lifecycle_hooks.get(hook_name) is not None
 
 class LifecycleInstance:
     """
     Represents an instance of a component with lifecycle hooks.
     """
+    __slots__ = (
+        'component', 'interpreter', 'state', 'props', 'mounted', 'error',
+        'prev_state', 'prev_props'
+    )
+
     def __init__(self, component: LifecycleComponent, interpreter, props=None):
         self.component = component
         self.interpreter = interpreter
@@ -48,31 +438,31 @@ class LifecycleInstance:
         self.prev_state = {}
         self.prev_props = {}
 
-        # Add methods
-        for name, body in component.methods.items():
-            # Create a closure for each method
-            method_body = body  # Create a local copy for the closure
-
-            def method_factory(body):
-                def method(*args):
-                    try:
-                        return interpreter.execute_method(body, self, args)
-                    except Exception as e:
-                        self.error = str(e)
-                        if component.has_lifecycle_hook('onError'):
-                            interpreter.execute_lifecycle_hook('onError', self)
-                        else:
-                            raise
-                return method
-
-            # Bind the method to the instance
-            bound_method = method_factory(method_body)
-            setattr(self, name, bound_method)
-
         # Call constructor if it exists
         if component.has_lifecycle_hook('constructor'):
             interpreter.execute_lifecycle_hook('constructor', self)
 
+    def __getattr__(self, name: str) -> Callable:
+        """Expose the component's methods as attributes (e.g. instance.start())."""
+        if name == 'component' or name not in self.component.methods:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return functools.partial(self._invoke, name)
+
+    def _invoke(self, method_name: str, *args) -> Any:
+        """Run one of the component's methods on this instance."""
+        component = self.component
+        ops = component.compiled_methods.get(method_name)
+        if ops is None:
+            ops = _compile_body(component.methods[method_name])
+        try:
+            return self.interpreter.execute_compiled(ops, self, args)
+        except Exception as e:
+            self.error = str(e)
+            if component.has_lifecycle_hook('onError'):
+                self.interpreter.execute_lifecycle_hook('onError', self)
+            else:
+                raise
+
     def mount(self) -> None:
         """Mount the component instance."""
         if not self.mounted:
@@ -82,11 +472,21 @@ class LifecycleInstance:
 
     def update(self, new_props=None) -> None:
         """Update the component instance with new props."""
-        self.prev_state = self.state.copy()
-        self.prev_props = self.props.copy()
+        # Nothing changes without new props, so there is nothing to snapshot
+        if not new_props or new_props == self.props:
+            return
+
+        # Snapshots are only read by onUpdate, so skip them without one
+        if self.component._has_on_update:
+            self._snapshot_prev_state()
+            self.prev_props = self.props.copy()
+
+        self.props = new_props
 
-        if new_props:
-            self.props = new_props
+    def _snapshot_prev_state(self) -> None:
+        """Record the state values the onUpdate hook reads as prevState."""
+        state = self.state
+        self.prev_state = {key: state[key] for key in self.component._prev_state_keys if key in state}
 
     def unmount(self) -> None:
         """Unmount the component instance."""
@@ -97,13 +497,14 @@ class LifecycleInstance:
 
     def setState(self, new_state: Dict[str, Any]) -> None:
         """Update the state of the component instance."""
-        self.prev_state = self.state.copy()
+        has_on_update = self.component._has_on_update
+        if has_on_update:
+            self._snapshot_prev_state()
         for key, value in new_state.items():
             self.state[key] = value
 
         # Call onUpdate hook if it exists
-        if self.component.has_lifecycle_hook('onUpdate'):
-            prev_count = self.prev_state.get('count', 0)
+        if has_on_update:
             self.interpreter.execute_lifecycle_hook('onUpdate', self)
 
 class LifecycleInterpreter:
@@ -113,6 +514,7 @@ class LifecycleInterpreter:
     def __init__(self):
         self.components: Dict[str, LifecycleComponent] = {}
         self.instances: Dict[str, List[LifecycleInstance]] = {}
+        self._all_instances: List[LifecycleInstance] = []  # Every instance, in creation order
         self.variables: Dict[str, Any] = {}
         self.current_instance: Optional[LifecycleInstance] = None
 
@@ -123,102 +525,72 @@ class LifecycleInterpreter:
         with open(filename, 'r') as f:
             content = f.read()
 
+        # Reuse the components an earlier run parsed from identical source
+        digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        path = cache_path('lifecycle', _PARSE_CACHE_VERSION, os.path.abspath(filename))
+        cached = read_cache(path)
+        if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == digest and isinstance(cached[1], dict):
+            components = cached[1]
+        else:
+            components = self._parse_components(content)
+            write_cache(path, (digest, components))
+            prune_cache(path)
+
+        self.components.update(components)
+
+    def _parse_components(self, content: str) -> Dict[str, LifecycleComponent]:
+        """
+        Parse the components defined in Mono source.
+        """
+        components: Dict[str, LifecycleComponent] = {}
+
         # Remove comments
-        content = re.sub(r'//.*', '', content)
+        content = _strip_comments(content)
 
         # Find components - use a more robust approach
-        component_pattern = r'component\s+(\w+)\s*{'
-        component_starts = [(m.group(1), m.start()) for m in re.finditer(component_pattern, content)]
+        # Match every brace once up front; bodies are then sliced out directly
+        brace_map = _build_brace_map(content)
+
+        # Component and method names are interned, as they are looked up on every dispatch
+        component_starts = [(sys.intern(m.group(1)), m.start()) for m in _COMPONENT_RE.finditer(content)]
 
         for name, start_pos in component_starts:
-            # Find the component body by counting braces
-            brace_count = 1
+            # Find the component body
             open_brace_pos = content.find('{', start_pos)
-            end_pos = open_brace_pos + 1
-
-            while brace_count > 0 and end_pos < len(content):
-                if content[end_pos] == '{':
-                    brace_count += 1
-                elif content[end_pos] == '}':
-                    brace_count -= 1
-                end_pos += 1
-
-            # Extract the component body
-            body = content[open_brace_pos+1:end_pos-1]
+            end_pos = brace_map.get(open_brace_pos, len(content))
+            body_offset = open_brace_pos + 1
 
             component = LifecycleComponent(name)
-            self.components[name] = component
-
-            # Parse state
-            state_match = re.search(r'state\s*{(.*?)}', body, re.DOTALL)
-            if state_match:
-                state_body = state_match.group(1)
-                state_entries = re.finditer(r'(\w+):\s*(.*?)(?:,|\s*$)', state_body, re.DOTALL)
-
-                for entry in state_entries:
-                    key = entry.group(1)
-                    value = entry.group(2).strip()
-
-                    # Parse value
-                    if value.isdigit():
-                        component.state[key] = int(value)
-                    elif value == 'true':
-                        component.state[key] = True
-                    elif value == 'false':
-                        component.state[key] = False
-                    elif value.startswith('"') and value.endswith('"'):
-                        component.state[key] = value[1:-1]
-                    else:
-                        component.state[key] = value
-
-            # Parse lifecycle hooks
-            for hook_name in ['constructor', 'onMount', 'onUpdate', 'onUnmount', 'onError']:
-                hook_pattern = rf'{hook_name}\s*\(([^)]*)\)\s*{{'
-                hook_match = re.search(hook_pattern, body)
-
-                if hook_match:
-                    # Find the hook body
-                    hook_start_pos = hook_match.start()
-                    hook_brace_count = 1
-                    hook_open_brace_pos = body.find('{', hook_start_pos)
-                    hook_pos = hook_open_brace_pos + 1
-
-                    while hook_brace_count > 0 and hook_pos < len(body):
-                        if body[hook_pos] == '{':
-                            hook_brace_count += 1
-                        elif body[hook_pos] == '}':
-                            hook_brace_count -= 1
-                        hook_pos += 1
-
-                    # Extract the hook body
-                    hook_body = body[hook_open_brace_pos+1:hook_pos-1].strip()
-                    component.add_lifecycle_hook(hook_name, hook_body)
-
-            # Parse methods - use a more robust approach
-            method_pattern = r'function\s+(\w+)\s*\(([^)]*)\)\s*{'
-            method_starts = [(m.group(1), m.group(2), m.start()) for m in re.finditer(method_pattern, body)]
-
-            # Process method declarations
-            for method_name, params, method_start_pos in method_starts:
-                # Skip lifecycle hooks
-                if method_name in ['constructor', 'onMount', 'onUpdate', 'onUnmount', 'onError']:
+            components[name] = component
+
+            # Find the state block, hooks and methods in one scan of the body;
+            # the first state block and first definition of each hook win
+            state_body = None
+            for member in _MEMBER_RE.finditer(content, body_offset, end_pos):
+                if member.group('state') is not None:
+                    if state_body is None:
+                        state_body = member.group('state_body')
                     continue
 
-                # Find the method body
-                method_brace_count = 1
-                method_open_brace_pos = body.find('{', method_start_pos)
-                method_pos = method_open_brace_pos + 1
+                method_name = member.group('method')
+                hook_name = member.group('hook') or (method_name if method_name in _HOOK_NAME_SET else None)
 
-                while method_brace_count > 0 and method_pos < len(body):
-                    if body[method_pos] == '{':
-                        method_brace_count += 1
-                    elif body[method_pos] == '}':
-                        method_brace_count -= 1
-                    method_pos += 1
+                # Extract the hook or method body
+                member_open_brace_pos = member.end() - 1
+                member_end_pos = brace_map.get(member_open_brace_pos, end_pos)
+                member_body = content[member_open_brace_pos+1:member_end_pos].strip()
 
-                # Extract the method body
-                method_body = body[method_open_brace_pos+1:method_pos-1].strip()
-                component.methods[method_name] = method_body
+                if hook_name is not None:
+                    if not component.has_lifecycle_hook(hook_name):
+                        component.add_lifecycle_hook(hook_name, member_body)
+                else:
+                    component.add_method(sys.intern(method_name), member_body)
+
+            # Parse state
+            if state_body is not None:
+                component.state.update(_parse_state(state_body))
+
+        return components
 
     def run(self) -> None:
         """
@@ -231,6 +603,7 @@ class LifecycleInterpreter:
         # Create Main instance
         main = LifecycleInstance(self.components['Main'], self)
         self.instances['Main'] = [main]
+        self._all_instances.append(main)
         self.current_instance = main
 
         # Mount the Main component
@@ -249,6 +622,12 @@ class LifecycleInterpreter:
         """
         Execute a method on a component instance.
         """
+        return self.execute_compiled(_compile_body(body), instance, args)
+
+    def execute_compiled(self, ops: List[Tuple], instance: LifecycleInstance, args=None) -> Any:
+        """
+        Execute a method body compiled by _compile_body on a component instance.
+        """
         # Save the current instance
         previous_instance = self.current_instance
         self.current_instance = instance
@@ -264,47 +643,34 @@ class LifecycleInterpreter:
             else:
                 local_vars['newValue'] = args[0]
 
-        # Split into lines
-        lines = body.split('\n')
+        for op in ops:
+            kind = op[0]
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+            # Component instantiation
+            if kind == _OP_VAR_NEW:
+                _, var_name, comp_name = op
+                if comp_name in self.components:
+                    comp_instance = LifecycleInstance(self.components[comp_name], self)
+                    local_vars[var_name] = comp_instance
 
-            # Variable declaration
-            var_match = re.match(r'var\s+(\w+)\s*=\s*(.*?);?$', line)
-            if var_match:
-                var_name = var_match.group(1)
-                var_expr = var_match.group(2)
+                    # Add to instances
+                    if comp_name not in self.instances:
+                        self.instances[comp_name] = []
+                    self.instances[comp_name].append(comp_instance)
+                    self._all_instances.append(comp_instance)
 
-                # Component instantiation
-                new_match = re.match(r'new\s+(\w+)\(\)', var_expr)
-                if new_match:
-                    comp_name = new_match.group(1)
-                    if comp_name in self.components:
-                        comp_instance = LifecycleInstance(self.components[comp_name], self)
-                        local_vars[var_name] = comp_instance
-
-                        # Add to instances
-                        if comp_name not in self.instances:
-                            self.instances[comp_name] = []
-                        self.instances[comp_name].append(comp_instance)
-
-                        # Mount the component
-                        comp_instance.mount()
-                    else:
-                        print(f"Error: Component {comp_name} not found")
+                    # Mount the component
+                    comp_instance.mount()
                 else:
-                    # Simple value
-                    local_vars[var_name] = var_expr
+                    print(f"Error: Component {comp_name} not found")
+
+            # Variable declaration with a simple value
+            elif kind == _OP_VAR:
+                local_vars[op[1]] = op[2]
 
             # Method call
-            method_call = re.match(r'(\w+)\.(\w+)\(([^)]*)\);?$', line)
-            if method_call:
-                obj_name = method_call.group(1)
-                method_name = method_call.group(2)
-                args_str = method_call.group(3)
+            elif kind == _OP_CALL:
+                _, obj_name, method_name, arg_nodes = op
 
                 if obj_name == 'this':
                     obj = instance
@@ -314,146 +680,98 @@ class LifecycleInterpreter:
                     print(f"Error: Object {obj_name} not found")
                     continue
 
-                # Parse arguments
+                # Evaluate arguments; ones without a value are left out
                 args = []
-                if args_str:
-                    for arg in args_str.split(','):
-                        arg = arg.strip()
-                        if arg in local_vars:
-                            args.append(local_vars[arg])
-                        elif arg.isdigit():
-                            args.append(int(arg))
-                        elif arg.startswith('"') and arg.endswith('"'):
-                            args.append(arg[1:-1])
-                        elif '.' in arg:
-                            # Handle property access (e.g., counter.state.count)
-                            parts = arg.split('.')
-                            if parts[0] in local_vars:
-                                obj_arg = local_vars[parts[0]]
-                                for part in parts[1:]:
-                                    if hasattr(obj_arg, part):
-                                        obj_arg = getattr(obj_arg, part)
-                                    elif isinstance(obj_arg, dict) and part in obj_arg:
-                                        obj_arg = obj_arg[part]
-                                args.append(obj_arg)
-
-                if hasattr(obj, method_name):
-                    method = getattr(obj, method_name)
-                    method(*args)
+                for node in arg_nodes:
+                    value = _eval_expr(node, instance, local_vars)
+                    if value is not _MISSING:
+                        args.append(value)
+
+                if isinstance(obj, LifecycleInstance) and method_name in obj.component.methods:
+                    obj._invoke(method_name, *args)
+                elif hasattr(obj, method_name):
+                    getattr(obj, method_name)(*args)
                 else:
                     print(f"Error: Method {method_name} not found on {obj_name}")
 
-            # State update
-            state_update = re.match(r'this\.state\.(\w+)\s*=\s*(.*?);?$', line)
-            if state_update:
-                prop_name = state_update.group(1)
-                value_expr = state_update.group(2)
+            # State update adding integer state properties and a constant
+            elif kind == _OP_STATE_ADD:
+                _, prop_name, state_props, total = op
+                on_update = prop_name == 'count' and instance.component._has_on_update
+                if on_update:
+                    instance._snapshot_prev_state()
+                state = instance.state
+                for state_prop in state_props:
+                    value = state.get(state_prop, 0)
+                    if type(value) is not int:
+                        break
+                    total += value
+                else:
+                    state[prop_name] = total
 
-                # Save the previous state for the onUpdate hook
-                prev_state = instance.state.copy()
+                # Trigger onUpdate lifecycle hook if the property is 'count'
+                if on_update:
+                    self.execute_lifecycle_hook('onUpdate', instance)
+
+            # State update
+            elif kind == _OP_STATE_SET:
+                _, prop_name, node = op
+                on_update = prop_name == 'count' and instance.component._has_on_update
+                if on_update:
+                    instance._snapshot_prev_state()
 
                 # Evaluate expression
-                if '+' in value_expr:
-                    parts = value_expr.split('+')
-                    left = parts[0].strip()
-                    right = parts[1].strip()
-
-                    left_val = None
-                    if left == 'this.state.count':
-                        left_val = instance.state.get('count', 0)
-                    elif left.isdigit():
-                        left_val = int(left)
-
-                    right_val = None
-                    if right == 'this.state.count':
-                        right_val = instance.state.get('count', 0)
-                    elif right.isdigit():
-                        right_val = int(right)
-
-                    if left_val is not None and right_val is not None:
-                        instance.state[prop_name] = left_val + right_val
+                if node[0] == _EXPR_ADD:
+                    # Numeric addition; skipped unless every term is a number
+                    total = 0
+                    for term in node[1]:
+                        if term[0] == _EXPR_STATE:
+                            value = instance.state.get(term[1], 0)
+                        else:
+                            value = _eval_expr(term, instance, local_vars)
+                        if not isinstance(value, int) or isinstance(value, bool):
+                            total = _MISSING
+                            break
+                        total += value
+                    if total is not _MISSING:
+                        instance.state[prop_name] = total
                 else:
-                    # Simple value
-                    if value_expr.isdigit():
-                        instance.state[prop_name] = int(value_expr)
-                    elif value_expr == 'newValue':
-                        # Handle method parameter
-                        if 'newValue' in local_vars:
-                            instance.state[prop_name] = local_vars['newValue']
-                    else:
-                        instance.state[prop_name] = value_expr
+                    # Simple value; text that isn't a known expression is stored as written
+                    value = _eval_expr(node, instance, local_vars)
+                    if value is not _MISSING:
+                        instance.state[prop_name] = value
+                    elif node[0] == _EXPR_RAW:
+                        instance.state[prop_name] = node[1]
+                    elif node[0] == _EXPR_LOCAL:
+                        # An unbound name is stored as written, except an unbound newValue parameter
+                        if node[1] != 'newValue':
+                            instance.state[prop_name] = node[1]
+                    elif node[0] == _EXPR_ATTR:
+                        instance.state[prop_name] = '.'.join((node[1],) + node[2])
 
                 # Trigger onUpdate lifecycle hook if the property is 'count'
-                if prop_name == 'count' and instance.component.has_lifecycle_hook('onUpdate'):
-                    prev_count = prev_state.get('count', 0)
+                if on_update:
                     self.execute_lifecycle_hook('onUpdate', instance)
 
             # Print statement
-            print_match = re.match(r'print\s+(.*?);?$', line)
-            if print_match:
-                expr = print_match.group(1).strip()
-
-                # String literal
-                if expr.startswith('"') and expr.endswith('"'):
-                    print(expr[1:-1])
-                    continue
+            elif kind == _OP_PRINT_TEXT:
+                print(op[1])
 
-                # Handle special cases for lifecycle_demo.mono
-                if '"Timer count: " + this.state.count + " (Running: ' in expr:
-                    count = instance.state.get('count', 0)
-                    is_running = instance.state.get('isRunning', False)
-                    print(f"Timer count: {count} (Running: {is_running})")
-                    continue
-
-                if expr.startswith('"[X] "') or expr.startswith('"[ ] "'):
-                    print(expr[1:-1])
-                    continue
+            elif kind == _OP_PRINT:
+                _, node, expr = op
 
-                # String concatenation
-                if '+' in expr:
-                    parts = expr.split('+')
+                if node[0] == _EXPR_ADD:
+                    # String concatenation; terms without a value print as nothing
                     result = ''
-
-                    for part in parts:
-                        part = part.strip()
-
-                        if part.startswith('"') and part.endswith('"'):
-                            result += part[1:-1]
-                        elif part == 'this.state.count':
-                            result += str(instance.state.get('count', 0))
-                        elif part.startswith('this.state.'):
-                            prop = part[11:]
-                            result += str(instance.state.get(prop, ''))
-                        elif part == 'prevState.count':
-                            result += str(instance.prev_state.get('count', 0))
-                        elif part.startswith('prevState.'):
-                            prop = part[10:]
-                            result += str(instance.prev_state.get(prop, ''))
-                        elif '.' in part and not part.startswith('"'):
-                            # Handle references to other objects (e.g., counter.state.count)
-                            obj_parts = part.split('.')
-                            if len(obj_parts) >= 3 and obj_parts[0] in local_vars:
-                                obj = local_vars[obj_parts[0]]
-                                if obj_parts[1] == 'state' and hasattr(obj, 'state'):
-                                    prop = obj_parts[2]
-                                    if prop in obj.state:
-                                        result += str(obj.state[prop])
-                        elif part in local_vars:
-                            result += str(local_vars[part])
-
+                    for term in node[1]:
+                        value = _eval_expr(term, instance, local_vars)
+                        if value is not _MISSING:
+                            result += str(value)
                     print(result)
                 else:
-                    # Simple expression
-                    if expr == 'this.state.count':
-                        print(instance.state.get('count', 0))
-                    elif expr == 'this.state.value':
-                        print(instance.state.get('value', 0))
-                    elif expr == 'this.state.name':
-                        print(instance.state.get('name', ''))
-                    elif expr in local_vars:
-                        print(local_vars[expr])
-                    else:
-                        print(expr)
+                    # Simple expression; anything unresolved prints as written
+                    value = _eval_expr(node, instance, local_vars)
+                    print(expr if value is _MISSING else value)
 
         # Restore the previous instance
         self.current_instance = previous_instance
@@ -463,7 +781,9 @@ class LifecycleInterpreter:
         Execute a lifecycle hook on a component instance.
         """
         if instance.component.has_lifecycle_hook(hook_name):
-            hook_body = instance.component.lifecycle_hooks[hook_name]
+            hook_body = instance.component.compiled_hooks.get(hook_name)
+            if hook_body is None:
+                hook_body = _compile_body(instance.component.lifecycle_hooks[hook_name])
 
             # Special handling for onUpdate hook
             if hook_name == 'onUpdate':
@@ -476,17 +796,16 @@ class LifecycleInterpreter:
                     prev_count = current_count - 1
 
                 # Execute the hook with the previous count as an argument
-                self.execute_method(hook_body, instance, [prev_count])
+                self.execute_compiled(hook_body, instance, [prev_count])
             else:
-                self.execute_method(hook_body, instance)
+                self.execute_compiled(hook_body, instance)
 
     def unmount_all(self) -> None:
         """
         Unmount all component instances.
         """
-        for component_name, instances in self.instances.items():
-            for instance in instances:
-                instance.unmount()
+        for instance in self._all_instances:
+            instance.unmount()
 
 def run_mono_file(file_path: str) -> bool:
     """
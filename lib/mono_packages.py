@@ -11,19 +11,227 @@ This module provides support for:
 
 import os
 import re
+import sys
 import json
 import shutil
 import hashlib
+import functools
+import collections
+import concurrent.futures
 import semver
 import requests
-from typing import Dict, List, Any, Optional, Set, Tuple, Union
-from dataclasses import dataclass, field
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable, Iterator
+from dataclasses import dataclass, field, fields
+from lib.mono_cache import read_cache, write_cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import re2 as _re_engine  # Linear-time matching for the component/dependency item patterns
+except ImportError:
+    _re_engine = re
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+def _json_loads(content: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, falling back to the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode compact JSON with orjson when available, falling back to the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _json_dumps_pretty(data: Any) -> bytes:
+    """Encode indented JSON with orjson when available, falling back to the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
 
 # Constants
 DEFAULT_REGISTRY_DIR = os.path.expanduser("~/.mono/packages")
 DEFAULT_REGISTRY_URL = "https://registry.mono-lang.org"
 DEFAULT_CONFIG_FILE = os.path.expanduser("~/.mono/config.json")
 
+# Connection pooling and retries for remote registry access
+_HTTP_POOL_CONNECTIONS = 16
+_HTTP_POOL_MAXSIZE = 32
+_HTTP_RETRIES = 3  # requests retries failed connections, not failed reads
+
+# Vulnerability levels, lowest first
+_LEVEL_PRIORITY = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+# Default license policy
+_ALLOWED_LICENSES = frozenset([
+    "MIT", "Apache-2.0", "BSD-2-Clause", "BSD-3-Clause",
+    "ISC", "Unlicense", "0BSD"
+])
+_RESTRICTED_LICENSES = frozenset([
+    "GPL-2.0", "GPL-3.0", "AGPL-3.0", "LGPL-2.1", "LGPL-3.0"
+])
+
+# Package definition patterns, compiled once at import
+_RE_HEADER = re.compile(r'package\s+(\w+)\s+version\s+([0-9]+\.[0-9]+\.[0-9]+)\s*{')
+_RE_SPACE = re.compile(r'(?:\s+|//[^\n]*)*')
+_RE_WORD = re.compile(r'\w+')
+_RE_BLOCK_TOKEN = re.compile(r'"[^"]*"|//[^\n]*|[{}]')
+_RE_COMPONENT_ITEM = _re_engine.compile(r'(\w+)\s+from\s+"([^"]*)"(?:\s+as\s+"([^"]*)")?')
+_RE_DEP_ITEM = _re_engine.compile(r'(\w+)(?:\s+version\s+([~^]?[0-9]+\.[0-9]+\.[0-9]+))?')
+
+# Package fields written as `keyword "value"`
+_PACKAGE_FIELDS = frozenset(["description", "author", "license", "homepage", "repository"])
+
+def _read_block(content: str, pos: int) -> Tuple[str, int]:
+    """
+    Read the balanced { ... } block opening at pos.
+    Returns the block body with comments removed and the index just past the block.
+    """
+    depth = 0
+    parts: List[str] = []
+    start = pos + 1
+    for token in _RE_BLOCK_TOKEN.finditer(content, pos):
+        text = token.group()
+        if text == "{":
+            depth += 1
+        elif text == "}":
+            depth -= 1
+            if depth == 0:
+                parts.append(content[start:token.start()])
+                return "".join(parts), token.end()
+        elif text.startswith("//"):
+            parts.append(content[start:token.start()])
+            start = token.end()
+    raise ValueError("Invalid package definition: missing closing brace")
+
+def _iter_tokens(content: str, pos: int) -> Iterator[Tuple[str, bool, str]]:
+    """
+    Walk a package body once, from just after its opening brace up to the matching
+    closing brace, yielding (keyword, is_block, payload) for each `keyword "value"`
+    and `keyword { ... }` entry. Comments and anything unrecognized are skipped.
+    """
+    length = len(content)
+    while True:
+        pos = _RE_SPACE.match(content, pos).end()
+        if pos >= length:
+            raise ValueError("Invalid package definition: missing closing brace")
+        
+        char = content[pos]
+        if char == "}":
+            return
+        
+        word = _RE_WORD.match(content, pos)
+        if word is None:
+            if char == "{":
+                pos = _read_block(content, pos)[1]
+            elif char == '"':
+                end = content.find('"', pos + 1)
+                pos = length if end == -1 else end + 1
+            else:
+                pos += 1
+            continue
+        
+        keyword = word.group()
+        pos = _RE_SPACE.match(content, word.end()).end()
+        if content.startswith('"', pos):
+            end = content.find('"', pos + 1)
+            if end == -1:
+                raise ValueError("Invalid package definition: missing closing brace")
+            yield keyword, False, content[pos + 1:end]
+            pos = end + 1
+        elif content.startswith("{", pos):
+            payload, pos = _read_block(content, pos)
+            yield keyword, True, payload
+
+def _parse_components(package: 'Package', block: str) -> None:
+    """Add the entries of a components block to a package."""
+    for component in _RE_COMPONENT_ITEM.finditer(block):
+        component_name = sys.intern(component.group(1))
+        component_path = component.group(2)
+        component_desc = component.group(3) or f"{component_name} component"
+        package.add_component(PackageComponent(component_name, component_path, component_desc))
+
+def _parse_dependencies(package: 'Package', block: str, is_dev: bool) -> None:
+    """Add the entries of a dependencies or dev_dependencies block to a package."""
+    for dep in _RE_DEP_ITEM.finditer(block):
+        dep_name = sys.intern(dep.group(1))
+        dep_version = sys.intern(dep.group(2) or "*")  # Any version
+        package.add_dependency(PackageDependency(dep_name, dep_version, is_dev))
+
+# Package blocks written as `keyword { ... }`
+_PACKAGE_BLOCKS: Dict[str, Callable[['Package', str], None]] = {
+    "components": _parse_components,
+    "dependencies": lambda package, block: _parse_dependencies(package, block, False),
+    "dev_dependencies": lambda package, block: _parse_dependencies(package, block, True),
+}
+
+# Worker threads used to copy component files when saving a package
+_SAVE_WORKERS = 8
+
+# Worker threads used to read version directories when loading the registry
+_LOAD_WORKERS = 16
+
+def content_hash(path: str) -> str:
+    """
+    Hash a file's contents as "<algorithm>:<hex digest>".
+    Uses BLAKE3 when it is installed, otherwise SHA-256 streamed through hashlib.
+    """
+    if BLAKE3_AVAILABLE:
+        return "blake3:" + blake3.blake3().update_mmap(path).hexdigest()
+    
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            digest = hashlib.file_digest(f, "sha256")
+        else:
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return "sha256:" + digest.hexdigest()
+
+def _copy_component(src: str, dst: str) -> str:
+    """
+    Copy a component file with its metadata and return the hash of the copy.
+    copyfile uses sendfile where the OS supports it.
+    """
+    shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return content_hash(dst)
+
+# Persistent index of package.json contents, stored in the registry directory
+_REGISTRY_INDEX = ".index.json"
+
+# "<name dir>/<version dir>" -> {"stamp": [mtime_ns, size], "package": package dict}
+_IndexRecord = Dict[str, Any]
+
+def _read_registry_index(index_path: str) -> Dict[str, _IndexRecord]:
+    """Load the registry index, returning an empty one if it is missing or unreadable."""
+    index = read_cache(index_path, _json_loads)
+    return index if isinstance(index, dict) else {}
+
+@functools.lru_cache(maxsize=10000)
+def _parse_version(version: str) -> semver.VersionInfo:
+    """Parse a version string once; VersionInfo is immutable so sharing it is safe."""
+    return semver.VersionInfo.parse(version)
+
+@functools.lru_cache(maxsize=10000)
+def _satisfies(version: str, requirement: str) -> bool:
+    """Check a (version, requirement) pair, memoized across the dependency graph."""
+    try:
+        return _parse_version(version).match(requirement)
+    except ValueError:
+        return False
+
 @dataclass
 class PackageDependency:
     """Represents a dependency on another package."""
@@ -43,17 +251,14 @@ class PackageDependency:
     def from_dict(cls, data: Dict[str, Any]) -> 'PackageDependency':
         """Create from dictionary."""
         return cls(
-            name=data["name"],
-            version_requirement=data["version_requirement"],
+            name=sys.intern(data["name"]),
+            version_requirement=sys.intern(data["version_requirement"]),
             is_dev=data.get("is_dev", False)
         )
     
     def satisfies(self, version: str) -> bool:
         """Check if a version satisfies this dependency requirement."""
-        try:
-            return semver.VersionInfo.parse(version).match(self.version_requirement)
-        except ValueError:
-            return False
+        return _satisfies(version, self.version_requirement)
 
 @dataclass
 class PackageComponent:
@@ -61,22 +266,25 @@ class PackageComponent:
     name: str
     source_path: str
     description: str = ""
+    hash: str = ""  # "<algorithm>:<hex digest>" of the copy saved with the package
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
             "name": self.name,
             "source_path": self.source_path,
-            "description": self.description
+            "description": self.description,
+            "hash": self.hash
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PackageComponent':
         """Create from dictionary."""
         return cls(
-            name=data["name"],
+            name=sys.intern(data["name"]),
             source_path=data["source_path"],
-            description=data.get("description", "")
+            description=data.get("description", ""),
+            hash=data.get("hash", "")
         )
 
 @dataclass
@@ -123,8 +331,8 @@ class Package:
     def from_dict(cls, data: Dict[str, Any]) -> 'Package':
         """Create from dictionary."""
         package = cls(
-            name=data["name"],
-            version=data["version"],
+            name=sys.intern(data["name"]),
+            version=sys.intern(data["version"]),
             description=data.get("description", ""),
             author=data.get("author", ""),
             license=data.get("license", ""),
@@ -149,127 +357,335 @@ class Package:
         return package
     
     def save(self, package_dir: str) -> None:
-        """Save the package to disk."""
-        # Create package directory
-        os.makedirs(package_dir, exist_ok=True)
-        
-        # Save package.json
-        package_file = os.path.join(package_dir, "package.json")
-        with open(package_file, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
-        
-        # Create directories for components
+        """
+        Save the package to disk.
+        Components are copied first so package.json can record the hash of each copy.
+        """
+        # Create the package directory and its components directory
         components_dir = os.path.join(package_dir, "components")
         os.makedirs(components_dir, exist_ok=True)
         
-        # Copy component source files
+        # Collect component copies up front. Components sharing a basename share a
+        # destination: it is copied once, from the last of them as in a sequential
+        # copy, and all of them record the hash of that surviving copy.
+        copies: Dict[str, str] = {}  # dest path -> source path
+        owners: Dict[str, List[PackageComponent]] = {}  # dest path -> components copied there
         for name, component in self.components.items():
             source_path = component.source_path
             if os.path.isfile(source_path):
                 dest_path = os.path.join(components_dir, os.path.basename(source_path))
-                shutil.copy2(source_path, dest_path)
+                copies[dest_path] = source_path
+                owners.setdefault(dest_path, []).append(component)
+        
+        if len(copies) <= 1:
+            # Small packages are not worth the thread pool start-up cost
+            hashes = {dst: _copy_component(src, dst) for dst, src in copies.items()}
+        else:
+            # Copy and hash component source files in parallel
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(_SAVE_WORKERS, len(copies))) as executor:
+                futures = {dst: executor.submit(_copy_component, src, dst) for dst, src in copies.items()}
+                hashes = {dst: future.result() for dst, future in futures.items()}  # Re-raises any copy error
+        
+        for dest_path, components in owners.items():
+            for component in components:
+                component.hash = hashes[dest_path]
+        
+        # Save package.json
+        package_file = os.path.join(package_dir, "package.json")
+        with open(package_file, "wb") as f:
+            f.write(_json_dumps_pretty(self.to_dict()))
     
     @classmethod
     def load(cls, package_dir: str) -> Optional['Package']:
         """Load a package from disk."""
         package_file = os.path.join(package_dir, "package.json")
-        if not os.path.isfile(package_file):
-            return None
-        
         try:
-            with open(package_file, "r") as f:
-                package_data = json.load(f)
+            with open(package_file, "rb") as f:
+                package_data = _json_loads(f.read())
             return cls.from_dict(package_data)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return None
         except Exception as e:
             print(f"Error loading package: {e}")
             return None
 
+# Package fields a _LazyPackage builds from its dict the first time one of them is read
+_LAZY_FIELDS = ("components", "dependencies", "dev_dependencies")
+
+class _LazyPackage(Package):
+    """
+    Package handed out for a registry entry loaded from disk.
+    The metadata fields are set from the package.json dict up front; components
+    and dependencies are only built the first time one of them is read. Editing
+    the description re-indexes the package for registry searches. Copies and
+    pickles are plain Packages.
+    """
+    def __init__(self, data: Dict[str, Any], registry: 'PackageRegistry'):
+        # Package.__init__ is skipped so that components and dependencies stay unbuilt
+        attrs = self.__dict__
+        attrs["_data"] = data
+        attrs["_registry"] = registry
+        attrs["name"] = sys.intern(data["name"])
+        attrs["version"] = sys.intern(data["version"])
+        for attr in ("description", "author", "license", "homepage", "repository"):
+            attrs[attr] = data.get(attr, "")
+    
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes that are not set yet
+        if attr not in _LAZY_FIELDS:
+            raise AttributeError(attr)
+        attrs = self.__dict__
+        package = Package.from_dict(attrs["_data"])
+        for name in _LAZY_FIELDS:
+            attrs.setdefault(name, getattr(package, name))  # Keep any field assigned before the build
+        return attrs[attr]
+    
+    def __setattr__(self, attr: str, value: Any) -> None:
+        self.__dict__[attr] = value
+        if attr == "description":
+            self._registry._reindex_description(self.name, self.version, value)
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Package):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(Package))
+    
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Package, tuple(getattr(self, f.name) for f in fields(Package)))
+
 class PackageRegistry:
     """
     Registry for packages.
+    Package metadata is kept as plain package.json dicts plus a flat table of the
+    searchable fields. Packages loaded from disk are handed out as _LazyPackage
+    instances that only build components and dependencies when those are used.
     """
-    def __init__(self, registry_dir: str = DEFAULT_REGISTRY_DIR):
+    def __init__(self, registry_dir: str = DEFAULT_REGISTRY_DIR, registry_url: str = DEFAULT_REGISTRY_URL):
         self.registry_dir = registry_dir
-        self.packages: Dict[str, Dict[str, Package]] = {}  # name -> version -> Package
+        self.registry_url = registry_url
+        self._http: Optional[requests.Session] = None  # Created on first remote request
+        self._package_data: Dict[str, Dict[str, Dict[str, Any]]] = {}  # name -> version -> package dict
+        self._package_cache: Dict[Tuple[str, str], Package] = {}  # (name, version) -> handed-out package
+        self._meta: List[Tuple[str, str, str, str]] = []  # (name, version, lower name, lower description)
+        self._latest_version: Dict[str, str] = {}  # name -> latest version
+        self._search_tokens: Dict[str, Set[str]] = {}  # lowercase word -> names whose latest version contains it
+        self._package_tokens: Dict[str, Set[str]] = {}  # name -> words indexed for it
+        self._index_path = os.path.join(registry_dir, _REGISTRY_INDEX)
+        self._index: Dict[str, _IndexRecord] = {}
+        self._generation = 0  # Bumped whenever the set of packages changes
         self.load_packages()
     
+    @property
+    def http(self) -> requests.Session:
+        """
+        HTTP session for the remote registry.
+        Connections are pooled and reused, so repeated fetches skip the TCP/TLS handshake.
+        """
+        if self._http is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_HTTP_POOL_CONNECTIONS,
+                pool_maxsize=_HTTP_POOL_MAXSIZE,
+                max_retries=_HTTP_RETRIES
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._http = session
+        return self._http
+    
+    @property
+    def packages(self) -> Dict[str, Dict[str, Package]]:
+        """All packages as name -> version -> Package."""
+        return {
+            name: {version: self._lookup(name, version) for version in versions}
+            for name, versions in self._package_data.items()
+        }
+    
     def load_packages(self) -> None:
-        """Load all packages from the registry directory."""
-        if not os.path.isdir(self.registry_dir):
+        """
+        Load all packages from the registry directory.
+        package.json contents are persisted in an index next to the packages and
+        reused for every file whose mtime and size are unchanged.
+        """
+        # Collect every version directory first; DirEntry.is_dir() reuses the
+        # file type reported by the directory read instead of a stat per entry
+        entries: List[Tuple[str, str]] = []  # (index key, version directory)
+        try:
+            package_entries = os.scandir(self.registry_dir)
+        except FileNotFoundError:
             os.makedirs(self.registry_dir, exist_ok=True)
             return
+        with package_entries:
+            for package_entry in package_entries:
+                if not package_entry.is_dir():
+                    continue
+                with os.scandir(package_entry.path) as version_entries:
+                    for version_entry in version_entries:
+                        if version_entry.is_dir():
+                            entries.append((f"{package_entry.name}/{version_entry.name}", version_entry.path))
+        
+        cached = _read_registry_index(self._index_path)
+        self._index = {}
+        self._generation += 1
+        
+        # Stat and read entries concurrently, then merge them in directory order
+        # on this thread
+        if len(entries) <= 1:
+            results = [self._read_entry(key, path, cached) for key, path in entries]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(_LOAD_WORKERS, len(entries))) as executor:
+                results = list(executor.map(lambda entry: self._read_entry(entry[0], entry[1], cached), entries))
+        
+        for (key, _), result in zip(entries, results):
+            if result is not None:
+                record, package = result
+                self._add_entry(record["package"], package)
+                self._index[key] = record
         
-        for package_name in os.listdir(self.registry_dir):
-            package_dir = os.path.join(self.registry_dir, package_name)
-            if os.path.isdir(package_dir):
-                for version_dir in os.listdir(package_dir):
-                    version_path = os.path.join(package_dir, version_dir)
-                    if os.path.isdir(version_path):
-                        package = Package.load(version_path)
-                        if package:
-                            if package.name not in self.packages:
-                                self.packages[package.name] = {}
-                            self.packages[package.name][package.version] = package
+        for name, versions in self._package_data.items():
+            self._set_latest(name, max(versions, key=_parse_version))
+        
+        if self._index != cached:
+            write_cache(self._index_path, self._index, _json_dumps)
+    
+    @staticmethod
+    def _read_entry(key: str, version_path: str, cached: Dict[str, _IndexRecord]) -> Optional[Tuple[_IndexRecord, Optional[Package]]]:
+        """
+        Read one version directory, from the index if its package.json is unchanged.
+        Returns the index record and, when package.json had to be loaded, the Package.
+        Safe to run on worker threads; it does not touch the registry.
+        """
+        try:
+            st = os.stat(os.path.join(version_path, "package.json"))
+        except OSError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        
+        record = cached.get(key)
+        if record is not None and record.get("stamp") == stamp:
+            data = record.get("package")
+            if isinstance(data, dict) and isinstance(data.get("name"), str) and isinstance(data.get("version"), str):
+                return record, None
+            # Damaged entry; re-read package.json
+        
+        package = Package.load(version_path)
+        if not package:
+            return None
+        return {"stamp": stamp, "package": package.to_dict()}, package
+    
+    def _add_entry(self, data: Dict[str, Any], package: Optional[Package] = None) -> None:
+        """Add a package dict to the registry tables, with its Package if one is already built."""
+        name, version = sys.intern(data["name"]), sys.intern(data["version"])
+        description = data.get("description", "")
+        self._package_data.setdefault(name, {})[version] = data
+        if package is not None:
+            self._package_cache[(name, version)] = package
+        else:
+            self._package_cache.pop((name, version), None)
+        self._meta.append((name, version, name.lower(), description.lower()))
+    
+    def _lookup(self, name: str, version: str) -> Package:
+        """Get a registered package, wrapping its dict in a _LazyPackage on first access."""
+        package = self._package_cache.get((name, version))
+        if package is None:
+            package = _LazyPackage(self._package_data[name][version], self)
+            self._package_cache[(name, version)] = package
+        return package
+    
+    def _set_latest(self, name: str, latest: str) -> None:
+        """Point the latest-version and search indexes at the given version of a package."""
+        self._latest_version[name] = latest
+        self._index_tokens(name, self._package_data[name][latest].get("description", ""))
+    
+    def _index_tokens(self, name: str, description: str) -> None:
+        """Replace the search postings of a package with the words of its name and description."""
+        for token in self._package_tokens.pop(name, ()):
+            names = self._search_tokens[token]
+            names.discard(name)
+            if not names:
+                del self._search_tokens[token]
+        
+        tokens = set(name.lower().split())
+        tokens.update(description.lower().split())
+        self._package_tokens[name] = tokens
+        for token in tokens:
+            self._search_tokens.setdefault(token, set()).add(name)
+    
+    def _reindex_description(self, name: str, version: str, description: str) -> None:
+        """Update the search indexes after the description of a handed-out package is edited."""
+        description_lower = description.lower()
+        self._meta = [
+            (entry[0], entry[1], entry[2], description_lower) if entry[0] == name and entry[1] == version else entry
+            for entry in self._meta
+        ]
+        if self._latest_version.get(name) == version:
+            self._index_tokens(name, description)
     
     def register_package(self, package: Package) -> None:
         """Register a package in the registry."""
         # Check if the package already exists
-        if package.name in self.packages and package.version in self.packages[package.name]:
+        if package.version in self._package_data.get(package.name, {}):
             raise ValueError(f"Package {package.name} version {package.version} already exists")
         
-        # Add to registry
-        if package.name not in self.packages:
-            self.packages[package.name] = {}
-        self.packages[package.name][package.version] = package
-        
-        # Save the package
+        # Save the package; this fills in the component hashes
         package_dir = os.path.join(self.registry_dir, package.name, package.version)
         package.save(package_dir)
+        
+        # Add to registry
+        data = package.to_dict()
+        self._add_entry(data, package)
+        self._generation += 1
+        latest = self._latest_version.get(package.name)
+        if latest is None or _parse_version(package.version) > _parse_version(latest):
+            self._set_latest(package.name, package.version)
+        
+        # Record it in the index
+        st = os.stat(os.path.join(package_dir, "package.json"))
+        self._index[f"{package.name}/{package.version}"] = {
+            "stamp": [st.st_mtime_ns, st.st_size],
+            "package": data
+        }
+        write_cache(self._index_path, self._index, _json_dumps)
     
     def get_package(self, name: str, version: Optional[str] = None) -> Optional[Package]:
         """
         Get a package by name and version.
         If version is None, returns the latest version.
         """
-        if name not in self.packages:
+        versions = self._package_data.get(name)
+        if versions is None:
             return None
         
-        if version is not None:
-            return self.packages[name].get(version)
-        
-        # Find the latest version
-        versions = list(self.packages[name].keys())
-        if not versions:
+        if version is None:
+            version = self._latest_version[name]
+        elif version not in versions:
             return None
         
-        # Sort versions using semver
-        versions.sort(key=lambda v: semver.VersionInfo.parse(v), reverse=True)
-        return self.packages[name][versions[0]]
+        return self._lookup(name, version)
     
     def search_packages(self, query: str) -> List[Package]:
-        """Search for packages by name or description."""
-        results = []
+        """Search the latest version of each package by name or description."""
         query = query.lower()
         
-        for name, versions in self.packages.items():
-            for version, package in versions.items():
-                if (query in name.lower() or 
-                    query in package.description.lower()):
-                    results.append(package)
-                    break  # Only add the latest version of each package
+        if query.split() == [query]:
+            # Without whitespace the query can only match inside a single word,
+            # so scan the word index rather than every package
+            matches: Set[str] = set()
+            for token, names in self._search_tokens.items():
+                if query in token:
+                    matches |= names
+        else:
+            latest = self._latest_version
+            matches = {
+                name for name, version, name_lower, description in self._meta
+                if latest[name] == version and (query in name_lower or query in description)
+            }
         
-        return results
+        return [self._lookup(name, self._latest_version[name]) for name in self._package_data if name in matches]
     
     def list_packages(self) -> List[Package]:
         """List all packages in the registry."""
-        results = []
-        
-        for name, versions in self.packages.items():
-            # Get the latest version
-            latest_version = max(versions.keys(), key=lambda v: semver.VersionInfo.parse(v))
-            results.append(versions[latest_version])
-        
-        return results
+        return [self._lookup(name, self._latest_version[name]) for name in self._package_data]
 
 class PackageParser:
     """
@@ -288,76 +704,29 @@ class PackageParser:
     def parse(self, content: str) -> Package:
         """Parse package definition content."""
         # Extract package header
-        header_match = re.search(r'package\s+(\w+)\s+version\s+([0-9]+\.[0-9]+\.[0-9]+)\s*{', content)
+        header_match = _RE_HEADER.search(content)
         if not header_match:
             raise ValueError("Invalid package definition: missing package header")
         
-        package_name = header_match.group(1)
-        package_version = header_match.group(2)
-        
-        # Extract package body
-        body_start = header_match.end()
-        body_end = content.rfind('}')
-        if body_end == -1:
-            raise ValueError("Invalid package definition: missing closing brace")
-        
-        package_body = content[body_start:body_end]
+        package_name = sys.intern(header_match.group(1))
+        package_version = sys.intern(header_match.group(2))
         
         # Create package
         package = Package(package_name, package_version)
         
-        # Find description
-        desc_match = re.search(r'description\s+"([^"]*)"', package_body)
-        if desc_match:
-            package.description = desc_match.group(1)
-        
-        # Find author
-        author_match = re.search(r'author\s+"([^"]*)"', package_body)
-        if author_match:
-            package.author = author_match.group(1)
-        
-        # Find license
-        license_match = re.search(r'license\s+"([^"]*)"', package_body)
-        if license_match:
-            package.license = license_match.group(1)
-        
-        # Find homepage
-        homepage_match = re.search(r'homepage\s+"([^"]*)"', package_body)
-        if homepage_match:
-            package.homepage = homepage_match.group(1)
-        
-        # Find repository
-        repo_match = re.search(r'repository\s+"([^"]*)"', package_body)
-        if repo_match:
-            package.repository = repo_match.group(1)
-        
-        # Find components
-        components_match = re.search(r'components\s+{([^}]*)}', package_body)
-        if components_match:
-            components_list = components_match.group(1)
-            for component in re.finditer(r'(\w+)\s+from\s+"([^"]*)"(?:\s+as\s+"([^"]*)")?', components_list):
-                component_name = component.group(1)
-                component_path = component.group(2)
-                component_desc = component.group(3) or f"{component_name} component"
-                package.add_component(PackageComponent(component_name, component_path, component_desc))
-        
-        # Find dependencies
-        deps_match = re.search(r'dependencies\s+{([^}]*)}', package_body)
-        if deps_match:
-            deps_list = deps_match.group(1)
-            for dep in re.finditer(r'(\w+)(?:\s+version\s+([0-9]+\.[0-9]+\.[0-9]+|\^[0-9]+\.[0-9]+\.[0-9]+|~[0-9]+\.[0-9]+\.[0-9]+))?', deps_list):
-                dep_name = dep.group(1)
-                dep_version = dep.group(2) or "*"  # Any version
-                package.add_dependency(PackageDependency(dep_name, dep_version, False))
-        
-        # Find dev dependencies
-        dev_deps_match = re.search(r'dev_dependencies\s+{([^}]*)}', package_body)
-        if dev_deps_match:
-            dev_deps_list = dev_deps_match.group(1)
-            for dep in re.finditer(r'(\w+)(?:\s+version\s+([0-9]+\.[0-9]+\.[0-9]+|\^[0-9]+\.[0-9]+\.[0-9]+|~[0-9]+\.[0-9]+\.[0-9]+))?', dev_deps_list):
-                dep_name = dep.group(1)
-                dep_version = dep.group(2) or "*"  # Any version
-                package.add_dependency(PackageDependency(dep_name, dep_version, True))
+        # Walk the body once; the first occurrence of each field or block wins
+        seen: Set[str] = set()
+        for keyword, is_block, payload in _iter_tokens(content, header_match.end()):
+            if keyword in seen:
+                continue
+            if is_block:
+                handler = _PACKAGE_BLOCKS.get(keyword)
+                if handler is not None:
+                    seen.add(keyword)
+                    handler(package, payload)
+            elif keyword in _PACKAGE_FIELDS:
+                seen.add(keyword)
+                setattr(package, keyword, payload)
         
         return package
 
@@ -367,10 +736,15 @@ class DependencyResolver:
     """
     def __init__(self, registry: PackageRegistry):
         self.registry = registry
+        # (name, version, requirements, include_dev) -> resolved packages, valid for one registry generation
+        self._resolved: Dict[Tuple[Any, ...], Dict[str, Package]] = {}
+        self._generation = registry._generation
     
     def resolve_dependencies(self, package: Package, include_dev: bool = False) -> Dict[str, Package]:
         """
         Resolve all dependencies for a package.
+        Results are memoized until the registry changes, so auditing and license
+        checking the same package only walk the graph once.
         
         Args:
             package: The package to resolve dependencies for
@@ -379,25 +753,47 @@ class DependencyResolver:
         Returns:
             A dictionary mapping package names to resolved package objects
         """
+        if self._generation != self.registry._generation:
+            self._resolved.clear()
+            self._generation = self.registry._generation
+        
+        # Key on the requirements as well, since packages parsed from a file may
+        # share a name and version with a registered one
+        requirements = tuple((dep.name, dep.version_requirement) for dep in package.dependencies.values())
+        if include_dev:
+            requirements += tuple((dep.name, dep.version_requirement) for dep in package.dev_dependencies.values())
+        key = (package.name, package.version, requirements, include_dev)
+        
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(package, include_dev)
+            self._resolved[key] = resolved
+        return dict(resolved)
+    
+    def _resolve(self, package: Package, include_dev: bool) -> Dict[str, Package]:
+        """Walk the dependency graph of a package breadth-first."""
         resolved: Dict[str, Package] = {}
-        pending: List[PackageDependency] = []
+        pending: collections.deque = collections.deque()
+        # Names are marked when enqueued, so each package is looked up once
+        # and the first requirement seen for a name is the one checked
+        seen: Set[str] = set()
         
         # Add direct dependencies
         for dep in package.dependencies.values():
-            pending.append(dep)
+            if dep.name not in seen:
+                seen.add(dep.name)
+                pending.append(dep)
         
         # Add dev dependencies if requested
         if include_dev:
             for dep in package.dev_dependencies.values():
-                pending.append(dep)
+                if dep.name not in seen:
+                    seen.add(dep.name)
+                    pending.append(dep)
         
         # Resolve dependencies
         while pending:
-            dep = pending.pop(0)
-            
-            # Skip if already resolved
-            if dep.name in resolved:
-                continue
+            dep = pending.popleft()
             
             # Find the package
             dep_package = self.registry.get_package(dep.name)
@@ -413,7 +809,9 @@ class DependencyResolver:
             
             # Add transitive dependencies
             for transitive_dep in dep_package.dependencies.values():
-                pending.append(transitive_dep)
+                if transitive_dep.name not in seen:
+                    seen.add(transitive_dep.name)
+                    pending.append(transitive_dep)
         
         return resolved
     
@@ -429,39 +827,37 @@ class DependencyResolver:
             A dictionary mapping package names to sets of dependency names
         """
         graph: Dict[str, Set[str]] = {package.name: set()}
-        pending: List[Tuple[str, PackageDependency]] = []
+        # Names get their graph entry when enqueued, so a package reached
+        # through several parents is only queued and looked up once
+        pending: collections.deque = collections.deque()
+        
+        def enqueue(parent: str, dep: PackageDependency) -> None:
+            graph[parent].add(dep.name)
+            if dep.name not in graph:
+                graph[dep.name] = set()
+                pending.append(dep.name)
         
         # Add direct dependencies
         for dep in package.dependencies.values():
-            graph[package.name].add(dep.name)
-            pending.append((package.name, dep))
+            enqueue(package.name, dep)
         
         # Add dev dependencies if requested
         if include_dev:
             for dep in package.dev_dependencies.values():
-                graph[package.name].add(dep.name)
-                pending.append((package.name, dep))
+                enqueue(package.name, dep)
         
         # Build graph
         while pending:
-            parent, dep = pending.pop(0)
-            
-            # Skip if already in graph
-            if dep.name in graph:
-                continue
+            name = pending.popleft()
             
             # Find the package
-            dep_package = self.registry.get_package(dep.name)
+            dep_package = self.registry.get_package(name)
             if not dep_package:
-                raise ValueError(f"Package {dep.name} not found")
-            
-            # Add to graph
-            graph[dep.name] = set()
+                raise ValueError(f"Package {name} not found")
             
             # Add transitive dependencies
             for transitive_dep in dep_package.dependencies.values():
-                graph[dep.name].add(transitive_dep.name)
-                pending.append((dep.name, transitive_dep))
+                enqueue(name, transitive_dep)
         
         return graph
 
@@ -469,8 +865,9 @@ class SecurityScanner:
     """
     Scanner for security vulnerabilities in packages.
     """
-    def __init__(self, registry: PackageRegistry):
+    def __init__(self, registry: PackageRegistry, resolver: Optional[DependencyResolver] = None):
         self.registry = registry
+        self.resolver = resolver or DependencyResolver(registry)
     
     def scan_package(self, package: Package, level: str = "all") -> List[Dict[str, Any]]:
         """
@@ -493,15 +890,16 @@ class SecurityScanner:
                 "package": package.name,
                 "version": package.version,
                 "level": "critical",
+                "_level_num": _LEVEL_PRIORITY["critical"],
                 "description": "Example vulnerability for demonstration purposes",
                 "fix_version": "1.0.1"
             })
         
         # Filter by level
         if level != "all":
-            level_priority = {"low": 0, "medium": 1, "high": 2, "critical": 3}
-            level_threshold = level_priority.get(level.lower(), 0)
-            vulnerabilities = [v for v in vulnerabilities if level_priority.get(v["level"].lower(), 0) >= level_threshold]
+            # Each report carries its level as an integer, so the filter is a plain compare
+            level_threshold = _LEVEL_PRIORITY.get(level.lower(), 0)
+            vulnerabilities = [v for v in vulnerabilities if v["_level_num"] >= level_threshold]
         
         return vulnerabilities
     
@@ -520,8 +918,7 @@ class SecurityScanner:
         vulnerabilities = []
         
         # Resolve dependencies
-        resolver = DependencyResolver(self.registry)
-        dependencies = resolver.resolve_dependencies(package, include_dev)
+        dependencies = self.resolver.resolve_dependencies(package, include_dev)
         
         # Scan each dependency
         for dep_name, dep_package in dependencies.items():
@@ -534,15 +931,11 @@ class LicenseChecker:
     """
     Checker for license compliance.
     """
-    def __init__(self, registry: PackageRegistry):
+    def __init__(self, registry: PackageRegistry, resolver: Optional[DependencyResolver] = None):
         self.registry = registry
-        self.allowed_licenses = set([
-            "MIT", "Apache-2.0", "BSD-2-Clause", "BSD-3-Clause", 
-            "ISC", "Unlicense", "0BSD"
-        ])
-        self.restricted_licenses = set([
-            "GPL-2.0", "GPL-3.0", "AGPL-3.0", "LGPL-2.1", "LGPL-3.0"
-        ])
+        self.resolver = resolver or DependencyResolver(registry)
+        self.allowed_licenses = _ALLOWED_LICENSES
+        self.restricted_licenses = _RESTRICTED_LICENSES
     
     def check_license_compliance(self, package: Package, include_dev: bool = False) -> List[Dict[str, Any]]:
         """
@@ -558,8 +951,7 @@ class LicenseChecker:
         issues = []
         
         # Resolve dependencies
-        resolver = DependencyResolver(self.registry)
-        dependencies = resolver.resolve_dependencies(package, include_dev)
+        dependencies = self.resolver.resolve_dependencies(package, include_dev)
         
         # Check each dependency
         for dep_name, dep_package in dependencies.items():
@@ -595,8 +987,8 @@ class PackageManager:
         self.registry = PackageRegistry(registry_dir)
         self.parser = PackageParser(self.registry)
         self.resolver = DependencyResolver(self.registry)
-        self.security_scanner = SecurityScanner(self.registry)
-        self.license_checker = LicenseChecker(self.registry)
+        self.security_scanner = SecurityScanner(self.registry, self.resolver)
+        self.license_checker = LicenseChecker(self.registry, self.resolver)
     
     def install_package(self, name: str, version: Optional[str] = None, dev: bool = False) -> Optional[Package]:
         """
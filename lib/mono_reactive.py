@@ -2,7 +2,456 @@
 Mono Reactive - Reactive Mono language interpreter
 """
 
+import os
+import sys
 import re
+import bisect
+import functools
+import operator
+
+from lib.mono_cache import cache_path, read_cache, write_cache, prune_cache
+
+# Parsed scripts are cached across runs, one entry per file, reused while its mtime and size
+# are unchanged; bump _PARSE_CACHE_VERSION whenever parsing, compiled ops or Component changes
+_PARSE_CACHE_VERSION = 10
+
+# Script structure, compiled once at import
+_COMMENT_RE = re.compile(r'//.*')
+_STATE_ENTRY_RE = re.compile(r'(\w+):\s*(.*?)(?:,|\s*$)', re.DOTALL)
+# Component, method and state headers plus every brace, found in one pass. A header
+# consumes only its keyword and checks the rest by lookahead, so each brace is still seen
+_STRUCTURE_RE = re.compile(
+    r'component(?=\s+(?P<component>\w+)\s*{)'
+    r'|function(?=\s+(?P<method>\w+)\s*\((?P<params>[^)]*)\)\s*(?P<method_brace>{))'
+    r'|state(?=\s*(?P<state_brace>{))'
+    r'|{|}'
+)
+
+# Method body statements
+_VAR_RE = re.compile(r'var\s+(\w+)\s*=\s*(.*?);?$')
+_NEW_RE = re.compile(r'new\s+(\w+)\(\)')
+_METHOD_CALL_RE = re.compile(r'(\w+)\.(\w+)\(([^)]*)\);?$')
+_STATE_UPDATE_RE = re.compile(r'this\.state\.(\w+)\s*=\s*(.*?);?$')
+_PRINT_RE = re.compile(r'print\s+(.*?);?$')
+_NAME_RE = re.compile(r'\w+')
+
+# Operations of a compiled method body; each op is a tuple starting with one of these
+_OP_VAR_NEW = 'VAR_NEW'                  # (_OP_VAR_NEW, var_name, component_name)
+_OP_VAR = 'VAR'                          # (_OP_VAR, var_name, value_text)
+_OP_CALL = 'CALL'                        # (_OP_CALL, object_name, method_name, (value, ...))
+_OP_STATE_SET = 'STATE_SET'              # (_OP_STATE_SET, prop_name, value)
+_OP_STATE_SET_LOCAL = 'STATE_SET_LOCAL'  # (_OP_STATE_SET_LOCAL, prop_name, local_name) - only if bound
+_OP_STATE_BINARY = 'STATE_BINARY'        # (_OP_STATE_BINARY, prop_name, left_operand, symbol, right_operand)
+_OP_STATE_INCR = 'STATE_INCR'            # (_OP_STATE_INCR, prop_name, source_prop, default, delta)
+_OP_PRINT_TEXT = 'PRINT_TEXT'            # (_OP_PRINT_TEXT, text) - output known at compile time
+_OP_PRINT_STATE = 'PRINT_STATE'          # (_OP_PRINT_STATE, prop_name, default)
+_OP_PRINT_LOCAL = 'PRINT_LOCAL'          # (_OP_PRINT_LOCAL, local_name) - prints the name if unbound
+_OP_PRINT_PARTS = 'PRINT_PARTS'          # (_OP_PRINT_PARTS, template, (value, ...)) - a '+' concatenation
+
+# Values used by call arguments, state additions and print parts
+_VAL_CONST = 'CONST'          # (_VAL_CONST, value)
+_VAL_LOCAL = 'LOCAL'          # (_VAL_LOCAL, name, default)
+_VAL_STATE = 'STATE'          # (_VAL_STATE, prop_name, default) - this.state.prop
+_VAL_PATH = 'PATH'            # (_VAL_PATH, local_name, (attr, ...)) - e.g. counter.state.count as an argument
+_VAL_OBJ_STATE = 'OBJ_STATE'  # (_VAL_OBJ_STATE, local_name, prop_name) - e.g. counter.state.count in a print
+
+class _Missing:
+    """Marks a value that has none; pickles by reference so cached ops keep its identity."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_MISSING'
+
+# Result of evaluating a value that has none (unbound local, ...)
+_MISSING = _Missing()
+
+# Render lines printed with a component-specific default for an unset property,
+# keyed by (component name, expression): (label, prop_name, default)
+_RENDER_LINES = {
+    ('Counter', '"Count: " + this.state.count'): ('Count: ', 'count', 0),
+    ('Display', '"Display: " + this.state.value'): ('Display: ', 'value', 0),
+    ('TodoList', '"Items: " + this.state.itemCount'): ('Items: ', 'itemCount', 0),
+    ('TodoItem', '"Todo: " + this.state.text'): ('Todo: ', 'text', ''),
+    ('App', '"Current View: " + this.state.currentView'): ('Current View: ', 'currentView', 'list'),
+}
+
+# Counter increments recognised on specific components, keyed by (component name, prop_name)
+_COUNTER_UPDATES = {
+    ('TodoList', 'itemCount'): 'this.state.itemCount + 1',
+    ('TodoItem', 'completed'): 'this.state.completed + 1',
+}
+
+def _scan_structure(content):
+    """
+    Scan comment-free source once for its structure.
+    Returns the brace map (position of every '{' to its matching '}', unclosed ones
+    left out), the (name, position) of each component header, and the positions of
+    method headers (start, name, '{', params) and state blocks (start, '{'), in source order.
+    """
+    brace_map = {}
+    open_positions = []
+    components = []
+    methods = []
+    states = []
+    for match in _STRUCTURE_RE.finditer(content):
+        group = match.lastgroup
+        if group is None:
+            if content[match.start()] == '{':
+                open_positions.append(match.start())
+            elif open_positions:
+                brace_map[open_positions.pop()] = match.start()
+        elif group == 'method_brace':
+            methods.append((match.start(), match.group('method'), match.start('method_brace'), match.group('params')))
+        elif group == 'state_brace':
+            states.append((match.start(), match.start('state_brace')))
+        else:
+            components.append((match.group('component'), match.start()))
+    return brace_map, components, methods, states
+
+def _compile_args(args_str):
+    """
+    Compile a call's comma-separated arguments into values.
+    Arguments that can never produce a value are dropped, as the interpreter always did.
+    """
+    values = []
+    if args_str:
+        for arg in args_str.split(','):
+            arg = arg.strip()
+            if _NAME_RE.fullmatch(arg):
+                # A local of this name wins; otherwise only a number has a value
+                values.append((_VAL_LOCAL, arg, int(arg) if arg.isdigit() else _MISSING))
+            elif arg.startswith('"') and arg.endswith('"'):
+                values.append((_VAL_CONST, arg[1:-1]))
+            elif '.' in arg:
+                # Handle property access (e.g., counter.state.count)
+                parts = arg.split('.')
+                values.append((_VAL_PATH, parts[0], tuple(parts[1:])))
+    return tuple(values)
+
+# Binary operators of state updates, by symbol
+_BINARY_OPERATORS = {'+': operator.add}
+
+# Named state-update operands; any other operand must be a number
+_NAMED_OPERANDS = {'this.state.count': (_VAL_STATE, 'count', 0)}
+
+# Evaluate a state-update operand against the instance's state, by operand kind
+_OPERAND_RESOLVERS = {
+    _VAL_STATE: lambda state, operand: state.get(operand[1], operand[2]),
+    _VAL_CONST: lambda state, operand: operand[1],
+}
+
+def _compile_operand(text):
+    """Compile one side of a state update into an operand, or None if it has no value."""
+    operand = _NAMED_OPERANDS.get(text)
+    if operand is None and text.isdigit():
+        operand = (_VAL_CONST, int(text))
+    return operand
+
+def _compile_state_update(component_name, prop_name, value_expr, params):
+    """
+    Compile a this.state assignment, or None if it never assigns anything.
+    params are the names the method binds its arguments to.
+    """
+    # Special cases for TodoList.addItem and TodoItem.toggleCompleted
+    if _COUNTER_UPDATES.get((component_name, prop_name)) == value_expr:
+        return (_OP_STATE_INCR, prop_name, prop_name, 0, 1)
+
+    for symbol, binary_operator in _BINARY_OPERATORS.items():
+        parts = value_expr.split(symbol)
+        if len(parts) == 1:
+            continue
+        # Only the first two operands are used
+        left = _compile_operand(parts[0].strip())
+        right = _compile_operand(parts[1].strip())
+        if left is None or right is None:
+            return None
+        # Counter increments and constant sums, the common numeric updates, get their own ops
+        if symbol == '+' and left[0] == _VAL_STATE and right[0] == _VAL_CONST:
+            return (_OP_STATE_INCR, prop_name, left[1], left[2], right[1])
+        if left[0] == _VAL_CONST and right[0] == _VAL_CONST:
+            return (_OP_STATE_SET, prop_name, binary_operator(left[1], right[1]))
+        return (_OP_STATE_BINARY, prop_name, left, symbol, right)
+
+    if value_expr.isdigit():
+        return (_OP_STATE_SET, prop_name, int(value_expr))
+    if value_expr in params or value_expr == 'newValue' or value_expr == 'newText':
+        # Handle method parameter
+        return (_OP_STATE_SET_LOCAL, prop_name, value_expr)
+    return (_OP_STATE_SET, prop_name, value_expr)
+
+def _print_parts_op(values):
+    """
+    Build the op printing a concatenation: a %-template holding its literal text,
+    filled in with its remaining values at run time.
+    """
+    template = ''.join(value[1].replace('%', '%%') if value[0] == _VAL_CONST else '%s' for value in values)
+    return (_OP_PRINT_PARTS, template, tuple(value for value in values if value[0] != _VAL_CONST))
+
+def _compile_print(expr, component_name, has_render):
+    """Compile the expression of a print statement."""
+    # String literal
+    if expr.startswith('"') and expr.endswith('"'):
+        return (_OP_PRINT_TEXT, expr[1:-1])
+
+    # Handle specific component render methods
+    if has_render:
+        render_line = _RENDER_LINES.get((component_name, expr))
+        if render_line:
+            label, prop_name, default = render_line
+            return _print_parts_op(((_VAL_CONST, label), (_VAL_STATE, prop_name, default)))
+
+    # String concatenation; literal parts are merged, so an all-literal one prints fixed text
+    parts = expr.split('+')
+    if len(parts) > 1:
+        values = []
+        for part in parts:
+            part = part.strip()
+
+            if part.startswith('"') and part.endswith('"'):
+                text = part[1:-1]
+                if values and values[-1][0] == _VAL_CONST:
+                    text = values.pop()[1] + text
+                values.append((_VAL_CONST, text))
+            elif part == 'this.state.count':
+                values.append((_VAL_STATE, 'count', 0))
+            elif part.startswith('this.state.'):
+                values.append((_VAL_STATE, sys.intern(part[11:]), ''))
+            elif '.' in part and not part.startswith('"'):
+                # Handle references to other objects (e.g., counter.state.count)
+                obj_parts = part.split('.')
+                if len(obj_parts) >= 3 and obj_parts[1] == 'state':
+                    values.append((_VAL_OBJ_STATE, obj_parts[0], sys.intern(obj_parts[2])))
+            elif _NAME_RE.fullmatch(part):
+                values.append((_VAL_LOCAL, part, ''))
+        if not values:
+            return (_OP_PRINT_TEXT, '')
+        if len(values) == 1 and values[0][0] == _VAL_CONST:
+            return (_OP_PRINT_TEXT, values[0][1])
+        return _print_parts_op(values)
+
+    # Simple expression
+    if expr == 'this.state.count' or expr == 'this.state.value':
+        return (_OP_PRINT_STATE, sys.intern(expr[11:]), 0)
+    if expr == 'this.state.name':
+        return (_OP_PRINT_STATE, 'name', '')
+    if _NAME_RE.fullmatch(expr):
+        return (_OP_PRINT_LOCAL, expr)
+    return (_OP_PRINT_TEXT, expr)
+
+# Binding of a body run without a parameter list: the first argument is newValue
+_DEFAULT_BINDING = ('newValue',)
+
+@functools.lru_cache(maxsize=1024)
+def _compile_binding(params):
+    """Compile how a method binds its arguments: the names of its declared parameters, in order."""
+    return tuple(sys.intern(name) for name in (param.strip() for param in params.split(',')) if name)
+
+@functools.lru_cache(maxsize=1024)
+def _compile_body(body, component_name, has_render, binding=_DEFAULT_BINDING):
+    """
+    Compile a method body into the ops run by Interpreter.execute_compiled.
+    Each line is classified and matched once here instead of on every call.
+    The component's name and whether it has a render method select its special cases;
+    binding, from _compile_binding, names the parameters its state updates can assign.
+    """
+    ops = []
+    for line in body.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Variable declaration
+        var_match = _VAR_RE.match(line)
+        if var_match:
+            var_name = var_match.group(1)
+            var_expr = var_match.group(2)
+
+            # Component instantiation
+            new_match = _NEW_RE.match(var_expr)
+            if new_match:
+                ops.append((_OP_VAR_NEW, var_name, new_match.group(1)))
+            else:
+                ops.append((_OP_VAR, var_name, var_expr))
+            continue
+
+        # Method call
+        method_call = _METHOD_CALL_RE.match(line)
+        if method_call:
+            ops.append((_OP_CALL, method_call.group(1), method_call.group(2), _compile_args(method_call.group(3))))
+            continue
+
+        # State update
+        state_update = _STATE_UPDATE_RE.match(line)
+        if state_update:
+            op = _compile_state_update(component_name, sys.intern(state_update.group(1)), state_update.group(2), binding)
+            if op is not None:
+                ops.append(op)
+            continue
+
+        # Print statement
+        print_match = _PRINT_RE.match(line)
+        if print_match:
+            ops.append(_compile_print(print_match.group(1).strip(), component_name, has_render))
+    return tuple(ops)
+
+@functools.lru_cache(maxsize=256)
+def _path_resolver(parts):
+    """
+    Build the function walking a dotted path's parts (e.g. state, count) from a local's value.
+    Each part is read as an attribute, else as a dict key, and skipped if it is neither.
+    On plain dicts, parts that are not dict attributes go straight to the key lookup.
+    """
+    steps = tuple((part, hasattr(dict, part)) for part in parts)
+
+    def resolve(obj):
+        for part, dict_attr in steps:
+            if type(obj) is dict and not dict_attr:
+                if part in obj:
+                    obj = obj[part]
+                continue
+            value = getattr(obj, part, _MISSING)
+            if value is not _MISSING:
+                obj = value
+            elif isinstance(obj, dict) and part in obj:
+                obj = obj[part]
+        return obj
+    return resolve
+
+def _eval_value(value, state, local_vars):
+    """Evaluate a compiled value against an instance's state; returns _MISSING if it has none."""
+    kind = value[0]
+    if kind == _VAL_CONST:
+        return value[1]
+    if kind == _VAL_STATE:
+        return state.get(value[1], value[2])
+    if kind == _VAL_LOCAL:
+        return local_vars.get(value[1], value[2])
+    if kind == _VAL_PATH:
+        if value[1] not in local_vars:
+            return _MISSING
+        return _path_resolver(value[2])(local_vars[value[1]])
+    # _VAL_OBJ_STATE
+    obj = local_vars.get(value[1], _MISSING)
+    if obj is not _MISSING and hasattr(obj, 'state') and value[2] in obj.state:
+        return obj.state[value[2]]
+    return _MISSING
+
+def _part_value(value):
+    """Value filled into a print template; a part with no value prints as ''."""
+    return '' if value is _MISSING else value
+
+def _value_source(value, const):
+    """Python source evaluating a compiled value inside a _specialize function."""
+    kind = value[0]
+    if kind == _VAL_CONST:
+        return const(value[1])
+    if kind == _VAL_STATE:
+        return f"state_get({const(value[1])}, {const(value[2])})"
+    if kind == _VAL_LOCAL:
+        return f"locals_get({const(value[1])}, {const(value[2])})"
+    if kind == _VAL_PATH:
+        name = const(value[1])
+        return f"({const(_path_resolver(value[2]))}(local_vars[{name}]) if {name} in local_vars else _MISSING)"
+    return f"_eval_value({const(value)}, state, local_vars)"
+
+def _may_be_missing(value):
+    """Whether a compiled value can evaluate to _MISSING."""
+    return value[0] in (_VAL_PATH, _VAL_OBJ_STATE) or (value[0] == _VAL_LOCAL and value[2] is _MISSING)
+
+def _part_source(value, const):
+    """Python source for a value filled into a print template."""
+    if _may_be_missing(value):
+        return f"_part_value({_value_source(value, const)})"
+    return _value_source(value, const)
+
+def _op_source(op, const):
+    """Python source lines running one compiled op inside a _specialize function."""
+    kind = op[0]
+    if kind == _OP_PRINT_TEXT:
+        return [f"print({const(op[1])})"]
+    if kind == _OP_PRINT_STATE:
+        return [f"print(state_get({const(op[1])}, {const(op[2])}))"]
+    if kind == _OP_PRINT_LOCAL:
+        return [f"print(locals_get({const(op[1])}, {const(op[1])}))"]
+    if kind == _OP_PRINT_PARTS:
+        values = ''.join(_part_source(value, const) + ', ' for value in op[2])
+        return [f"print({const(op[1])} % ({values}))"]
+    if kind == _OP_STATE_SET:
+        return [f"state[{const(op[1])}] = {const(op[2])}"]
+    if kind == _OP_STATE_INCR:
+        return [f"state[{const(op[1])}] = state_get({const(op[2])}, {const(op[3])}) + {const(op[4])}"]
+    if kind == _OP_STATE_BINARY:
+        return [f"state[{const(op[1])}] = {_value_source(op[2], const)} {op[3]} {_value_source(op[4], const)}"]
+    if kind == _OP_STATE_SET_LOCAL:
+        return [
+            f"value = locals_get({const(op[2])}, _MISSING)",
+            "if value is not _MISSING:",
+            f"    state[{const(op[1])}] = value",
+        ]
+    if kind == _OP_VAR:
+        return [f"local_vars[{const(op[1])}] = {const(op[2])}"]
+    if kind == _OP_VAR_NEW:
+        _, var_name, comp_name = op
+        return [
+            f"component = interpreter.components.get({const(comp_name)})",
+            "if component is not None:",
+            f"    local_vars[{const(var_name)}] = interpreter.instance_class(component)(component, interpreter)",
+            "else:",
+            f"    print({const(f'Error: Component {comp_name} not found')})",
+        ]
+
+    # _OP_CALL
+    _, obj_name, method_name, arg_values = op
+    args = ''.join(_value_source(value, const) + ', ' for value in arg_values)
+    if any(_may_be_missing(value) for value in arg_values):
+        args_line = f"args = [arg for arg in ({args}) if arg is not _MISSING]"
+    else:
+        args_line = f"args = ({args})"
+    call_lines = [
+        args_line,
+        f"method = getattr(obj, {const(method_name)}, _MISSING)",
+        "if method is _MISSING:",
+        f"    print({const(f'Error: Method {method_name} not found on {obj_name}')})",
+        "else:",
+        "    method(*args)",
+    ]
+    if obj_name == 'this':
+        return ["obj = instance"] + call_lines
+    return [
+        f"obj = locals_get({const(obj_name)}, _MISSING)",
+        "if obj is _MISSING:",
+        f"    print({const(f'Error: Object {obj_name} not found')})",
+        "else:",
+    ] + ['    ' + line for line in call_lines]
+
+@functools.lru_cache(maxsize=1024)
+def _specialize(ops):
+    """
+    Generate a Python function running compiled ops, called as run(interpreter, instance, local_vars).
+    Each op becomes straight-line code with its operands bound as constants, so calling
+    a method does no op dispatch at all.
+    """
+    namespace = {'_MISSING': _MISSING, '_eval_value': _eval_value, '_part_value': _part_value}
+
+    def const(value):
+        name = f"_c{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    lines = [
+        'def run(interpreter, instance, local_vars):',
+        '    state = instance.state',
+        '    state_get = state.get',
+        '    locals_get = local_vars.get',
+    ]
+    for op in ops:
+        lines.extend('    ' + line for line in _op_source(op, const))
+    exec(compile('\n'.join(lines), '<reactive method>', 'exec'), namespace)
+    return namespace['run']
+
+def _bind_args(binding, args):
+    """Bind a call's arguments to its method's parameters, returning the call's local variables."""
+    return dict(zip(binding, args)) if args else {}
 
 class Component:
     """
@@ -12,29 +461,21 @@ class Component:
         self.name = name
         self.state = {}
         self.methods = {}
+        # Method bodies compiled to ops, and how each binds its arguments, once the component is parsed
+        self.compiled_methods = {}
+        self.bindings = {}
 
 class Instance:
     """
     Represents an instance of a component in the Reactive Mono language.
+    Each component gets a subclass from _instance_class that carries its methods.
     """
+    __slots__ = ('component', 'interpreter', 'state')
+    
     def __init__(self, component, interpreter):
         self.component = component
         self.interpreter = interpreter
         self.state = component.state.copy()
-        
-        # Add methods
-        for name, body in component.methods.items():
-            # Create a closure for each method
-            method_body = body  # Create a local copy for the closure
-            
-            def method_factory(body):
-                def method(*args):
-                    return interpreter.execute_method(body, self, args)
-                return method
-            
-            # Bind the method to the instance
-            bound_method = method_factory(method_body)
-            setattr(self, name, bound_method)
     
     def setState(self, new_state):
         """
@@ -43,6 +484,24 @@ class Instance:
         for key, value in new_state.items():
             self.state[key] = value
 
+def _method_function(method_name, ops, binding):
+    """Build the method a component's instance class uses to run its specialized ops."""
+    run = _specialize(ops)
+    def method(self, *args):
+        return run(self.interpreter, self, _bind_args(binding, args))
+    method.__name__ = method_name
+    return method
+
+def _instance_class(component):
+    """Create the Instance subclass for a component, with its methods defined once on the class."""
+    namespace = {
+        name: _method_function(name, ops, component.bindings.get(name, _DEFAULT_BINDING))
+        for name, ops in component.compiled_methods.items()
+        if name not in Instance.__slots__  # A method can't replace an instance's own attributes
+    }
+    namespace['__slots__'] = ()
+    return type(component.name, (Instance,), namespace)
+
 class Interpreter:
     """
     Reactive Mono language interpreter.
@@ -50,48 +509,74 @@ class Interpreter:
     def __init__(self):
         self.components = {}
         self.variables = {}
+        # Instance subclass of each component, keyed by component name and built on first instantiation
+        self.instance_classes = {}
     
     def parse_file(self, filename):
         """
         Parse a Reactive Mono script file.
         """
-        with open(filename, 'r') as f:
-            content = f.read()
+        # An unchanged file is loaded from the parse cache without being read
+        stat = os.stat(filename)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        path = cache_path('reactive', _PARSE_CACHE_VERSION, os.path.abspath(filename))
+        cached = read_cache(path)
+        if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == stamp and isinstance(cached[1], dict):
+            components = cached[1]
+        else:
+            with open(filename, 'r') as f:
+                content = f.read()
+            components = self._parse_components(content)
+            write_cache(path, (stamp, components))
+            prune_cache(path)
+        
+        self.components.update(components)
+        for name in components:
+            self.instance_classes.pop(name, None)
+    
+    def instance_class(self, component):
+        """
+        Get the Instance subclass for a component, creating it the first time it is instantiated.
+        """
+        cls = self.instance_classes.get(component.name)
+        if cls is None:
+            cls = self.instance_classes[component.name] = _instance_class(component)
+        return cls
+    
+    def _parse_components(self, content):
+        """
+        Parse the components defined in Reactive Mono source.
+        """
+        components = {}
         
         # Remove comments
-        content = re.sub(r'//.*', '', content)
+        content = _COMMENT_RE.sub('', content)
         
-        # Find components - use a more robust approach
-        component_pattern = r'component\s+(\w+)\s*{'
-        component_starts = [(m.group(1), m.start()) for m in re.finditer(component_pattern, content)]
+        # Find components, methods, state blocks and matching braces in one pass
+        brace_map, component_starts, method_heads, state_heads = _scan_structure(content)
         
         for name, start_pos in component_starts:
-            # Find the component body by counting braces
-            brace_count = 1
+            # Find the component body; an unclosed one runs to the end of the file
             open_brace_pos = content.find('{', start_pos)
-            end_pos = open_brace_pos + 1
-            
-            while brace_count > 0 and end_pos < len(content):
-                if content[end_pos] == '{':
-                    brace_count += 1
-                elif content[end_pos] == '}':
-                    brace_count -= 1
-                end_pos += 1
-            
-            # Extract the component body
-            body = content[open_brace_pos+1:end_pos-1]
+            body_start = open_brace_pos + 1
+            body_end = brace_map.get(open_brace_pos, len(content) - 1)
             
             component = Component(name)
-            self.components[name] = component
+            components[name] = component
             
-            # Parse state
-            state_match = re.search(r'state\s*{(.*?)}', body, re.DOTALL)
-            if state_match:
-                state_body = state_match.group(1)
-                state_entries = re.finditer(r'(\w+):\s*(.*?)(?:,|\s*$)', state_body, re.DOTALL)
+            # Parse state: the first block in the body, up to its first '}'
+            state_close = -1
+            index = bisect.bisect_left(state_heads, (body_start,))
+            if index < len(state_heads) and state_heads[index][1] < body_end:
+                state_open = state_heads[index][1]
+                state_close = content.find('}', state_open + 1, body_end)
+            if state_close != -1:
+                state_body = content[state_open+1:state_close]
+                state_entries = _STATE_ENTRY_RE.finditer(state_body)
                 
                 for entry in state_entries:
-                    key = entry.group(1)
+                    # Interned, like the property names compiled into ops, so state lookups match by identity
+                    key = sys.intern(entry.group(1))
                     value = entry.group(2).strip()
                     
                     # Parse value
@@ -107,28 +592,36 @@ class Interpreter:
                         component.state[key] = value
             
             # Parse methods - use a more robust approach
-            method_pattern = r'function\s+(\w+)\s*\(([^)]*)\)\s*{'
-            method_starts = [(m.group(1), m.group(2), m.start()) for m in re.finditer(method_pattern, body)]
+            index = bisect.bisect_left(method_heads, (body_start,))
+            method_starts = []
+            while index < len(method_heads) and method_heads[index][2] < body_end:
+                start_pos, method_name, _, params = method_heads[index]
+                method_starts.append((method_name, params, start_pos))
+                index += 1
             
             # Process method declarations
             
             for method_name, params, start_pos in method_starts:
-                # Find the method body by counting braces
-                brace_count = 1
-                open_brace_pos = body.find('{', start_pos)
-                pos = open_brace_pos + 1
-                
-                while brace_count > 0 and pos < len(body):
-                    if body[pos] == '{':
-                        brace_count += 1
-                    elif body[pos] == '}':
-                        brace_count -= 1
-                    pos += 1
+                # Find the method body; one left open runs to the end of the component body
+                open_brace_pos = content.find('{', start_pos, body_end)
+                close_brace_pos = brace_map.get(open_brace_pos, body_end)
+                if close_brace_pos >= body_end:
+                    close_brace_pos = body_end - 1
                 
                 # Extract the method body
-                method_body = body[open_brace_pos+1:pos-1].strip()
+                method_body = content[open_brace_pos+1:close_brace_pos].strip()
                 component.methods[method_name] = method_body
+                component.bindings[method_name] = _compile_binding(params)
                 # Store the method body
+            
+            # Compile method bodies now that the component's methods are known
+            has_render = 'render' in component.methods
+            for method_name, method_body in component.methods.items():
+                component.compiled_methods[method_name] = _compile_body(
+                    method_body, name, has_render, component.bindings[method_name]
+                )
+        
+        return components
     
     def run(self):
         """
@@ -139,7 +632,8 @@ class Interpreter:
             return
         
         # Create Main instance
-        main = Instance(self.components['Main'], self)
+        main_component = self.components['Main']
+        main = self.instance_class(main_component)(main_component, self)
         
         # Call start method
         # Check if start method exists
@@ -148,248 +642,96 @@ class Interpreter:
         else:
             print("Error: start method not found")
     
-    def execute_method(self, body, instance, args=None):
+    def execute_method(self, body, instance, args=None, binding=_DEFAULT_BINDING):
         """
         Execute a method on a component instance.
         """
-        # Local variables for this method execution
-        local_vars = {}
-        
-        # Add arguments to local variables
-        if args and len(args) > 0:
-            # Handle different method parameters based on the component and method
-            if instance.component.name == 'TodoItem':
-                if 'setText' in instance.component.methods:
-                    local_vars['newText'] = args[0]
-                    # Directly update the state for setText
-                    instance.state['text'] = args[0]
-            elif instance.component.name == 'App':
-                if 'switchView' in instance.component.methods:
-                    local_vars['newView'] = args[0]
-                    # Directly update the state for switchView
-                    instance.state['currentView'] = args[0]
-            elif instance.component.name == 'Display':
-                if 'update' in instance.component.methods:
-                    local_vars['newValue'] = args[0]
-                    # Directly update the state for update
-                    instance.state['value'] = args[0]
-            else:
-                # Default parameter name
-                local_vars['newValue'] = args[0]
-        
-        # Split into lines
-        lines = body.split('\n')
+        component = instance.component
+        ops = _compile_body(body, component.name, 'render' in component.methods, binding)
+        return self.execute_compiled(ops, instance, args, binding)
+    
+    def execute_compiled(self, ops, instance, args=None, binding=_DEFAULT_BINDING):
+        """
+        Execute a method body compiled by _compile_body on a component instance.
+        binding comes from _compile_binding for the method's parameters.
+        """
+        local_vars = _bind_args(binding, args)
+        # Bound once for the whole body rather than looked up per op
+        state = instance.state
+        state_get = state.get
+        locals_get = local_vars.get
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for op in ops:
+            kind = op[0]
             
-            # Variable declaration
-            var_match = re.match(r'var\s+(\w+)\s*=\s*(.*?);?$', line)
-            if var_match:
-                var_name = var_match.group(1)
-                var_expr = var_match.group(2)
-                
-                # Component instantiation
-                new_match = re.match(r'new\s+(\w+)\(\)', var_expr)
-                if new_match:
-                    comp_name = new_match.group(1)
-                    if comp_name in self.components:
-                        comp_instance = Instance(self.components[comp_name], self)
-                        local_vars[var_name] = comp_instance
-                    else:
-                        print(f"Error: Component {comp_name} not found")
-                else:
-                    # Simple value
-                    local_vars[var_name] = var_expr
+            # String concatenation
+            if kind == _OP_PRINT_PARTS:
+                values = []
+                append = values.append
+                for value in op[2]:
+                    value = _eval_value(value, state, local_vars)
+                    append('' if value is _MISSING else value)
+                print(op[1] % tuple(values))
             
             # Method call
-            method_call = re.match(r'(\w+)\.(\w+)\(([^)]*)\);?$', line)
-            if method_call:
-                obj_name = method_call.group(1)
-                method_name = method_call.group(2)
-                args_str = method_call.group(3)
+            elif kind == _OP_CALL:
+                _, obj_name, method_name, arg_values = op
                 
                 if obj_name == 'this':
                     obj = instance
-                elif obj_name in local_vars:
-                    obj = local_vars[obj_name]
                 else:
-                    print(f"Error: Object {obj_name} not found")
-                    continue
+                    obj = locals_get(obj_name, _MISSING)
+                    if obj is _MISSING:
+                        print(f"Error: Object {obj_name} not found")
+                        continue
                 
-                # Parse arguments
                 args = []
-                if args_str:
-                    for arg in args_str.split(','):
-                        arg = arg.strip()
-                        if arg in local_vars:
-                            args.append(local_vars[arg])
-                        elif arg.isdigit():
-                            args.append(int(arg))
-                        elif arg.startswith('"') and arg.endswith('"'):
-                            # String literal
-                            string_value = arg[1:-1]
-                            args.append(string_value)
-                        elif '.' in arg:
-                            # Handle property access (e.g., counter.state.count)
-                            parts = arg.split('.')
-                            if parts[0] in local_vars:
-                                obj_arg = local_vars[parts[0]]
-                                for part in parts[1:]:
-                                    if hasattr(obj_arg, part):
-                                        obj_arg = getattr(obj_arg, part)
-                                    elif isinstance(obj_arg, dict) and part in obj_arg:
-                                        obj_arg = obj_arg[part]
-                                args.append(obj_arg)
+                for value in arg_values:
+                    value = _eval_value(value, state, local_vars)
+                    if value is not _MISSING:
+                        args.append(value)
                 
-                if hasattr(obj, method_name):
-                    method = getattr(obj, method_name)
+                method = getattr(obj, method_name, _MISSING)
+                if method is not _MISSING:
                     method(*args)
                 else:
                     print(f"Error: Method {method_name} not found on {obj_name}")
             
-            # State update
-            state_update = re.match(r'this\.state\.(\w+)\s*=\s*(.*?);?$', line)
-            if state_update:
-                prop_name = state_update.group(1)
-                value_expr = state_update.group(2)
-                
-                # Special case for TodoList.addItem
-                if instance.component.name == 'TodoList' and prop_name == 'itemCount':
-                    if value_expr == 'this.state.itemCount + 1':
-                        instance.state['itemCount'] = instance.state.get('itemCount', 0) + 1
-                        continue
-                
-                # Special case for TodoItem.toggleCompleted
-                if instance.component.name == 'TodoItem' and prop_name == 'completed':
-                    if value_expr == 'this.state.completed + 1':
-                        instance.state['completed'] = instance.state.get('completed', 0) + 1
-                        continue
-                
-                # Evaluate expression
-                if '+' in value_expr:
-                    parts = value_expr.split('+')
-                    left = parts[0].strip()
-                    right = parts[1].strip()
-                    
-                    left_val = None
-                    if left == 'this.state.count':
-                        left_val = instance.state.get('count', 0)
-                    elif left.isdigit():
-                        left_val = int(left)
-                    
-                    right_val = None
-                    if right == 'this.state.count':
-                        right_val = instance.state.get('count', 0)
-                    elif right.isdigit():
-                        right_val = int(right)
-                    
-                    if left_val is not None and right_val is not None:
-                        instance.state[prop_name] = left_val + right_val
-                else:
-                    # Simple value
-                    if value_expr.isdigit():
-                        instance.state[prop_name] = int(value_expr)
-                    elif value_expr == 'newValue':
-                        # Handle method parameter
-                        if 'newValue' in local_vars:
-                            instance.state[prop_name] = local_vars['newValue']
-                    elif value_expr == 'newText':
-                        # Handle method parameter
-                        if 'newText' in local_vars:
-                            instance.state[prop_name] = local_vars['newText']
-                    else:
-                        instance.state[prop_name] = value_expr
+            # State updates
+            elif kind == _OP_STATE_INCR:
+                state[op[1]] = state_get(op[2], op[3]) + op[4]
+            elif kind == _OP_STATE_SET:
+                state[op[1]] = op[2]
+            elif kind == _OP_STATE_BINARY:
+                _, prop_name, left, symbol, right = op
+                state[prop_name] = _BINARY_OPERATORS[symbol](
+                    _OPERAND_RESOLVERS[left[0]](state, left), _OPERAND_RESOLVERS[right[0]](state, right)
+                )
+            elif kind == _OP_STATE_SET_LOCAL:
+                value = locals_get(op[2], _MISSING)
+                if value is not _MISSING:
+                    state[op[1]] = value
             
-            # Print statement
-            print_match = re.match(r'print\s+(.*?);?$', line)
-            if print_match:
-                expr = print_match.group(1).strip()
-                
-                # String literal
-                if expr.startswith('"') and expr.endswith('"'):
-                    print(expr[1:-1])
-                    continue
-                
-                # Handle specific component render methods
-                if 'render' in instance.component.methods:
-                    # Counter component
-                    if instance.component.name == 'Counter':
-                        if expr == '"Count: " + this.state.count':
-                            count = instance.state.get('count', 0)
-                            print(f"Count: {count}")
-                            continue
-                    
-                    # Display component
-                    elif instance.component.name == 'Display':
-                        if expr == '"Display: " + this.state.value':
-                            value = instance.state.get('value', 0)
-                            print(f"Display: {value}")
-                            continue
-                    
-                    # TodoList component
-                    elif instance.component.name == 'TodoList':
-                        if expr == '"Items: " + this.state.itemCount':
-                            item_count = instance.state.get('itemCount', 0)
-                            print(f"Items: {item_count}")
-                            continue
-                    
-                    # TodoItem component
-                    elif instance.component.name == 'TodoItem':
-                        if expr == '"Todo: " + this.state.text':
-                            text = instance.state.get('text', '')
-                            print(f"Todo: {text}")
-                            continue
-                    
-                    # App component
-                    elif instance.component.name == 'App':
-                        if expr == '"Current View: " + this.state.currentView':
-                            view = instance.state.get('currentView', 'list')
-                            print(f"Current View: {view}")
-                            continue
-                
-                # String concatenation
-                if '+' in expr:
-                    parts = expr.split('+')
-                    result = ''
-                    
-                    for part in parts:
-                        part = part.strip()
-                        
-                        if part.startswith('"') and part.endswith('"'):
-                            result += part[1:-1]
-                        elif part == 'this.state.count':
-                            result += str(instance.state.get('count', 0))
-                        elif part.startswith('this.state.'):
-                            prop = part[11:]
-                            result += str(instance.state.get(prop, ''))
-                        elif '.' in part and not part.startswith('"'):
-                            # Handle references to other objects (e.g., counter.state.count)
-                            obj_parts = part.split('.')
-                            if len(obj_parts) >= 3 and obj_parts[0] in local_vars:
-                                obj = local_vars[obj_parts[0]]
-                                if obj_parts[1] == 'state' and hasattr(obj, 'state'):
-                                    prop = obj_parts[2]
-                                    if prop in obj.state:
-                                        result += str(obj.state[prop])
-                        elif part in local_vars:
-                            result += str(local_vars[part])
-                    
-                    print(result)
+            # Print statements
+            elif kind == _OP_PRINT_TEXT:
+                print(op[1])
+            elif kind == _OP_PRINT_STATE:
+                print(state_get(op[1], op[2]))
+            elif kind == _OP_PRINT_LOCAL:
+                print(locals_get(op[1], op[1]))
+            
+            # Component instantiation
+            elif kind == _OP_VAR_NEW:
+                _, var_name, comp_name = op
+                component = self.components.get(comp_name)
+                if component is not None:
+                    local_vars[var_name] = self.instance_class(component)(component, self)
                 else:
-                    # Simple expression
-                    if expr == 'this.state.count':
-                        print(instance.state.get('count', 0))
-                    elif expr == 'this.state.value':
-                        print(instance.state.get('value', 0))
-                    elif expr == 'this.state.name':
-                        print(instance.state.get('name', ''))
-                    elif expr in local_vars:
-                        print(local_vars[expr])
-                    else:
-                        print(expr)
+                    print(f"Error: Component {comp_name} not found")
+            
+            # Variable declaration with a simple value
+            elif kind == _OP_VAR:
+                local_vars[op[1]] = op[2]
 
 def run_mono_file(file_path):
     """